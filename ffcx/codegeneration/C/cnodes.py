@@ -4,13 +4,15 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import functools
 import logging
 import numbers
 
 import numpy
 from ffcx.codegeneration.C.format_lines import Indented, format_indented_lines
-from ffcx.codegeneration.C.format_value import (format_float, format_int,
-                                                format_value)
+from ffcx.codegeneration.C.format_value import (format_bool, format_float,
+                                                format_float_array,
+                                                format_int, format_value)
 from ffcx.codegeneration.C.precedence import PRECEDENCE
 
 logger = logging.getLogger("ffcx")
@@ -31,32 +33,48 @@ logger = logging.getLogger("ffcx")
 
 
 def is_zero_cexpr(cexpr):
-    return ((isinstance(cexpr, LiteralFloat) and cexpr.value == 0.0)
-            or (isinstance(cexpr, LiteralInt) and cexpr.value == 0))
+    return isinstance(cexpr, (LiteralFloat, LiteralInt)) and cexpr.value == 0
 
 
 def is_one_cexpr(cexpr):
-    return ((isinstance(cexpr, LiteralFloat) and cexpr.value == 1.0)
-            or (isinstance(cexpr, LiteralInt) and cexpr.value == 1))
+    return isinstance(cexpr, (LiteralFloat, LiteralInt)) and cexpr.value == 1
 
 
 def is_negative_one_cexpr(cexpr):
-    return ((isinstance(cexpr, LiteralFloat) and cexpr.value == -1.0)
-            or (isinstance(cexpr, LiteralInt) and cexpr.value == -1))
+    return isinstance(cexpr, (LiteralFloat, LiteralInt)) and cexpr.value == -1
 
 
 def float_product(factors):
     """Build product of float factors, simplifying ones and zeros and returning 1.0 if empty sequence."""
-    factors = [f for f in factors if not is_one_cexpr(f)]
-    if len(factors) == 0:
-        return LiteralFloat(1.0)
-    elif len(factors) == 1:
-        return factors[0]
+    nonunit_factors = []
+    literal_index = None
+    for f in factors:
+        if is_zero_cexpr(f):
+            # The whole product is zero, no need to look further
+            return f
+        if is_one_cexpr(f):
+            continue
+        if isinstance(f, (LiteralFloat, LiteralInt)):
+            if literal_index is None:
+                literal_index = len(nonunit_factors)
+            else:
+                # Fold numeric literals into a single factor
+                c = nonunit_factors[literal_index]
+                value = c.value * f.value
+                if isinstance(c, LiteralInt) and isinstance(f, LiteralInt):
+                    nonunit_factors[literal_index] = LiteralInt(value)
+                else:
+                    nonunit_factors[literal_index] = LiteralFloat(value)
+                continue
+        nonunit_factors.append(f)
+    if literal_index is not None and is_one_cexpr(nonunit_factors[literal_index]):
+        del nonunit_factors[literal_index]
+    if len(nonunit_factors) == 0:
+        return _one_float
+    elif len(nonunit_factors) == 1:
+        return nonunit_factors[0]
     else:
-        for f in factors:
-            if is_zero_cexpr(f):
-                return f
-        return Product(factors)
+        return Product(nonunit_factors)
 # CNode core
 
 
@@ -115,6 +133,8 @@ class CExpr(CNode):
             return other
         if is_zero_cexpr(other):
             return self
+        if isinstance(self, LiteralInt) and isinstance(other, LiteralInt):
+            return LiteralInt(self.value + other.value)
         if isinstance(other, Neg):
             return Sub(self, other.arg)
         return Add(self, other)
@@ -125,6 +145,8 @@ class CExpr(CNode):
             return other
         if is_zero_cexpr(other):
             return self
+        if isinstance(self, LiteralInt) and isinstance(other, LiteralInt):
+            return LiteralInt(other.value + self.value)
         if isinstance(self, Neg):
             return Sub(other, self.arg)
         return Add(other, self)
@@ -135,6 +157,8 @@ class CExpr(CNode):
             return -other
         if is_zero_cexpr(other):
             return self
+        if isinstance(self, LiteralInt) and isinstance(other, LiteralInt):
+            return LiteralInt(self.value - other.value)
         if isinstance(other, Neg):
             return Add(self, other.arg)
         return Sub(self, other)
@@ -145,6 +169,8 @@ class CExpr(CNode):
             return other
         if is_zero_cexpr(other):
             return -self
+        if isinstance(self, LiteralInt) and isinstance(other, LiteralInt):
+            return LiteralInt(other.value - self.value)
         if isinstance(self, Neg):
             return Add(other, self.arg)
         return Sub(other, self)
@@ -226,6 +252,13 @@ class CExprOperator(CExpr):
     __slots__ = ()
     sideeffect = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Build the operator string surrounded by spaces, used to format
+        # binary and n-ary operators, once per class
+        if "op" in cls.__dict__:
+            cls._spaced_op = f" {cls.op} "
+
 
 class CExprTerminal(CExpr):
     """Base class for all C expression terminals."""
@@ -316,7 +349,13 @@ class LiteralInt(CExprLiteral):
         return float(self.value)
 
     def __hash__(self):
-        return hash(self.ce_format())
+        return hash(self.value)
+
+
+# Shared instances of frequently created literals (nodes are never modified)
+_zero_int = LiteralInt(0)
+_one_int = LiteralInt(1)
+_one_float = LiteralFloat(1.0)
 
 
 class LiteralBool(CExprLiteral):
@@ -353,7 +392,7 @@ class LiteralString(CExprLiteral):
         self.value = value
 
     def ce_format(self, precision=None):
-        return '"%s"' % (self.value, )
+        return f'"{self.value}"'
 
     def __eq__(self, other):
         return isinstance(other, LiteralString) and self.value == other.value
@@ -379,7 +418,7 @@ class Symbol(CExprTerminal):
         return isinstance(other, Symbol) and self.name == other.name
 
     def __hash__(self):
-        return hash(self.ce_format())
+        return hash(self.name)
 
 
 # CExprOperator base classes
@@ -430,7 +469,7 @@ class PostfixUnaryOp(UnaryOp):
 
 
 class BinOp(CExprOperator):
-    __slots__ = ("lhs", "rhs")
+    __slots__ = ("lhs", "rhs", "_hash")
 
     def __init__(self, lhs, rhs):
         self.lhs = as_cexpr(lhs)
@@ -448,13 +487,19 @@ class BinOp(CExprOperator):
             rhs = '(' + rhs + ')'
 
         # Return combined string
-        return lhs + (" " + self.op + " ") + rhs
+        return lhs + self._spaced_op + rhs
 
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.lhs == other.lhs and self.rhs == other.rhs)
 
     def __hash__(self):
-        return hash(self.ce_format())
+        # Formatting the whole subtree is expensive and the node is
+        # never modified, so compute the hash only once
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(self.ce_format())
+            return self._hash
 
     def flops(self):
         return 1 + self.lhs.flops() + self.rhs.flops()
@@ -469,20 +514,13 @@ class NaryOp(CExprOperator):
         self.args = [as_cexpr(arg) for arg in args]
 
     def ce_format(self, precision=None):
-        # Format children
-        args = [arg.ce_format(precision) for arg in self.args]
-
-        # Apply parentheses
-        for i in range(len(args)):
-            if self.args[i].precedence >= self.precedence:
-                args[i] = '(' + args[i] + ')'
+        # Format children, applying parentheses
+        precedence = self.precedence
+        args = ['(' + arg.ce_format(precision) + ')' if arg.precedence >= precedence
+                else arg.ce_format(precision) for arg in self.args]
 
         # Return combined string
-        op = " " + self.op + " "
-        s = args[0]
-        for i in range(1, len(args)):
-            s += op + args[i]
-        return s
+        return self._spaced_op.join(args)
 
     def __eq__(self, other):
         return (isinstance(other, type(self)) and len(self.args) == len(other.args)
@@ -742,14 +780,13 @@ class FlattenedArray(object):
             dims = tuple(as_cexpr(i) for i in dims)
             self.dims = dims
             n = len(dims)
-            literal_one = LiteralInt(1)
-            strides = [literal_one] * n
+            strides = [_one_int] * n
             for i in range(n - 2, -1, -1):
                 s = strides[i + 1]
                 d = dims[i + 1]
-                if d == literal_one:
+                if d == _one_int:
                     strides[i] = s
-                elif s == literal_one:
+                elif s == _one_int:
                     strides[i] = d
                 else:
                     strides[i] = d * s
@@ -768,15 +805,14 @@ class FlattenedArray(object):
             # Handle scalar case, allowing dims=() and indices=() for A[0]
             if len(self.strides) != 0:
                 raise ValueError("Empty indices for nonscalar array.")
-            flat = LiteralInt(0)
+            flat = _zero_int
         else:
             i, s = (indices[0], self.strides[0])
-            literal_one = LiteralInt(1)
-            flat = (i if s == literal_one else s * i)
+            flat = (i if s == _one_int else s * i)
             if self.offset is not None:
                 flat = self.offset + flat
             for i, s in zip(indices[1:n], self.strides[1:n]):
-                flat = flat + (i if s == literal_one else s * i)
+                flat = flat + (i if s == _one_int else s * i)
         # Delay applying ArrayAccess until we have all indices
         if n == len(self.strides):
             return ArrayAccess(self.array, flat)
@@ -785,7 +821,7 @@ class FlattenedArray(object):
 
 
 class ArrayAccess(CExprOperator):
-    __slots__ = ("array", "indices")
+    __slots__ = ("array", "indices", "_hash")
     precedence = PRECEDENCE.SUBSCRIPT
 
     def __init__(self, array, indices):
@@ -824,17 +860,21 @@ class ArrayAccess(CExprOperator):
         return ArrayAccess(self.array, self.indices + indices)
 
     def ce_format(self, precision=None):
-        s = self.array.ce_format(precision)
-        for index in self.indices:
-            s += "[" + index.ce_format(precision) + "]"
-        return s
+        indices = "".join([f"[{index.ce_format(precision)}]" for index in self.indices])
+        return self.array.ce_format(precision) + indices
 
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.array == other.array
                 and self.indices == other.indices)
 
     def __hash__(self):
-        return hash(self.ce_format())
+        # Formatting the whole subtree is expensive and the node is
+        # never modified, so compute the hash only once
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(self.ce_format())
+            return self._hash
 
     def flops(self):
         return 0
@@ -857,14 +897,14 @@ class Conditional(CExprOperator):
 
         # Apply parentheses
         if self.condition.precedence >= self.precedence:
-            c = '(' + c + ')'
+            c = f"({c})"
         if self.true.precedence >= self.precedence:
-            t = '(' + t + ')'
+            t = f"({t})"
         if self.false.precedence >= self.precedence:
-            f = '(' + f + ')'
+            f = f"({f})"
 
         # Return combined string
-        return c + " ? " + t + " : " + f
+        return f"{c} ? {t} : {f}"
 
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.condition == other.condition
@@ -890,7 +930,7 @@ class Call(CExprOperator):
         self.arguments = [as_cexpr(arg) for arg in arguments]
 
     def ce_format(self, precision=None):
-        args = ", ".join(arg.ce_format(precision) for arg in self.arguments)
+        args = ", ".join([arg.ce_format(precision) for arg in self.arguments])
         return self.function.ce_format(precision) + "(" + args + ")"
 
     def __eq__(self, other):
@@ -1054,7 +1094,6 @@ class Statement(CStatement):
         return (isinstance(other, type(self)) and self.expr == other.expr)
 
     def flops(self):
-        # print(self.expr.rhs.flops())
         return self.expr.flops()
 
 
@@ -1128,7 +1167,7 @@ class Return(CStatement):
         if self.value is None:
             return "return;"
         else:
-            return "return %s;" % (self.value.ce_format(precision), )
+            return f"return {self.value.ce_format(precision)};"
 
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.value == other.value)
@@ -1262,22 +1301,16 @@ def build_1d_initializer_list(values, formatter, padlen=0, precision=None):
         def formatter(x, p):
             return str(x)
 
-    tokens = ["{ "]
-    if numpy.product(values.shape) > 0:
-        sep = ", "
-        fvalues = [formatter(v, precision) for v in values]
-        for v in fvalues[:-1]:
-            tokens.append(v)
-            tokens.append(sep)
-        tokens.append(fvalues[-1])
-        if padlen:
-            # Add padding
-            zero = formatter(values.dtype.type(0), precision)
-            for i in range(leftover(len(values), padlen)):
-                tokens.append(sep)
-                tokens.append(zero)
-    tokens += " }"
-    return "".join(tokens)
+    if formatter is format_float:
+        fvalues = format_float_array(values, precision)
+    else:
+        # Format Python scalars rather than NumPy scalars, which is much faster
+        fvalues = [formatter(v, precision) for v in values.tolist()]
+    if fvalues and padlen:
+        # Add padding
+        zero = formatter(values.dtype.type(0), precision)
+        fvalues.extend([zero] * leftover(len(values), padlen))
+    return "{ " + ", ".join(fvalues) + " }"
 
 
 def build_initializer_lists(values, sizes, level, formatter, padlen=0, precision=None):
@@ -1295,36 +1328,53 @@ def build_initializer_lists(values, sizes, level, formatter, padlen=0, precision
             return str(x)
 
     values = numpy.asarray(values)
-    assert numpy.product(values.shape) == numpy.product(sizes)
-    assert len(sizes) > 0
-    assert len(values.shape) > 0
-    assert len(sizes) == len(values.shape)
-    assert numpy.all(values.shape == sizes)
-
-    r = len(sizes)
-    assert r > 0
-    if r == 1:
-        return [build_1d_initializer_list(values, formatter, padlen=padlen, precision=precision)]
-    else:
-        # Render all sublists
-        parts = []
-        for val in values:
-            sublist = build_initializer_lists(
-                val, sizes[1:], level + 1, formatter, padlen=padlen, precision=precision)
-            parts.append(sublist)
-        # Add comma after last line in each part except the last one
-        for part in parts[:-1]:
-            part[-1] += ","
-        # Collect all lines in flat list
-        lines = []
-        for part in parts:
-            lines.extend(part)
-        # Enclose lines in '{ ' and ' }' and indent lines in between
-        lines[0] = "{ " + lines[0]
-        for i in range(1, len(lines)):
-            lines[i] = "  " + lines[i]
-        lines[-1] += " }"
-        return lines
+    sizes = tuple(sizes)
+    if not sizes or values.shape != sizes:
+        raise ValueError(f"Shape of values {values.shape} does not match array sizes {sizes}.")
+
+    return _build_initializer_lists(values, len(sizes), formatter, padlen, precision)
+
+
+@functools.lru_cache(maxsize=None)
+def _initializer_list_braces(outer_shape):
+    """Return the (prefix, suffix) enclosing each innermost row of an array with the given outer shape.
+
+    The braces, commas and indentation depend only on the shape, so they
+    are computed once and shared by all arrays of the same shape.
+    """
+    nrows = functools.reduce(lambda a, b: a * b, outer_shape, 1)
+    prefixes = [""] * nrows
+    suffixes = [""] * nrows
+
+    # Enclose the rows of each outer dimension, innermost first, in
+    # '{ ' and ' }', indenting the lines in between and separating the
+    # sublists by commas
+    block = 1
+    for n in reversed(outer_shape):
+        span = block * n
+        for k in range(nrows):
+            q = k % span
+            if q == span - 1:
+                suffixes[k] += " }"
+            elif q % block == block - 1:
+                suffixes[k] += ","
+            prefixes[k] = ("{ " if q == 0 else "  ") + prefixes[k]
+        block = span
+    return tuple(zip(prefixes, suffixes))
+
+
+def _build_initializer_lists(values, rank, formatter, padlen, precision):
+    """Build initializer list lines for values of given rank, assuming consistent shapes."""
+    # Format each innermost row on its own line, enclosed in the braces
+    # for the array shape
+    rows = values.reshape(-1, values.shape[-1])
+    braces = _initializer_list_braces(values.shape[:rank - 1])
+    return [prefix + build_1d_initializer_list(row, formatter, padlen=padlen, precision=precision) + suffix
+            for row, (prefix, suffix) in zip(rows, braces)]
+
+
+# Formatters of array initializer values, by numpy dtype kind
+_array_formatters = {"f": format_float, "i": format_int, "b": format_bool}
 
 
 class ArrayDecl(CStatement):
@@ -1375,7 +1425,7 @@ class ArrayDecl(CStatement):
         sizes = pad_innermost_dim(self.sizes, self.padlen)
 
         # Add brackets
-        brackets = ''.join("[%d]" % n for n in sizes)
+        brackets = ''.join([f"[{n}]" for n in sizes])
 
         # Join declaration
         decl = self.typename + " " + self.symbol.name + brackets
@@ -1392,16 +1442,7 @@ class ArrayDecl(CStatement):
             return f"{decl} = {lbr} 0 {rbr};"
         else:
             # Construct initializer lists for arbitrary multidimensional array values
-            if self.values.dtype.kind == "f":
-                formatter = format_float
-            elif self.values.dtype.kind == "i":
-                formatter = format_int
-            elif self.values.dtype == numpy.bool_:
-                def format_bool(x, precision=None):
-                    return "true" if x is True else "false"
-                formatter = format_bool
-            else:
-                formatter = format_value
+            formatter = _array_formatters.get(self.values.dtype.kind, format_value)
             initializer_lists = build_initializer_lists(
                 self.values, self.sizes, 0, formatter, padlen=self.padlen, precision=precision)
             if len(initializer_lists) == 1:
@@ -1411,9 +1452,10 @@ class ArrayDecl(CStatement):
                 return (decl + " =", Indented(initializer_lists))
 
     def __eq__(self, other):
-        attributes = ("typename", "symbol", "sizes", "padlen", "values")
+        attributes = ("typename", "symbol", "sizes", "padlen")
         return (isinstance(other, type(self))
-                and all(getattr(self, name) == getattr(self, name) for name in attributes))
+                and all(getattr(self, name) == getattr(other, name) for name in attributes)
+                and numpy.array_equal(self.values, other.values))
 
     def flops(self):
         return 0
@@ -1523,17 +1565,16 @@ class Switch(CStatement):
     def __init__(self, arg, cases, default=None, autobreak=True, autoscope=True):
         self.arg = as_cexpr_or_string_symbol(arg)
         self.cases = [(as_cexpr(value), as_cstatement(body)) for value, body in cases]
+        bodies = [body for _, body in self.cases]
         if default is not None:
             default = as_cstatement(default)
-            defcase = [(None, default)]
-        else:
-            defcase = []
+            bodies.append(default)
         self.default = default
         # If this is a switch where every case returns, scopes or breaks are never needed
-        if all(isinstance(case[1], Return) for case in self.cases + defcase):
+        if all(isinstance(body, Return) for body in bodies):
             autobreak = False
             autoscope = False
-        if all(case[1].is_scoped for case in self.cases + defcase):
+        if all(body.is_scoped for body in bodies):
             autoscope = False
         assert autobreak in (True, False)
         assert autoscope in (True, False)
@@ -1563,7 +1604,7 @@ class Switch(CStatement):
     def __eq__(self, other):
         attributes = ("arg", "cases", "default", "autobreak", "autoscope")
         return (isinstance(other, type(self))
-                and all(getattr(self, name) == getattr(self, name) for name in attributes))
+                and all(getattr(self, name) == getattr(other, name) for name in attributes))
 
 
 class ForRange(CStatement):
@@ -1580,16 +1621,11 @@ class ForRange(CStatement):
         self.index_type = index_type
 
     def cs_format(self, precision=None):
-        indextype = self.index_type
         index = self.index.ce_format(precision)
         begin = self.begin.ce_format(precision)
         end = self.end.ce_format(precision)
 
-        init = indextype + " " + index + " = " + begin
-        check = index + " < " + end
-        update = "++" + index
-
-        prelude = "for (" + init + "; " + check + "; " + update + ")"
+        prelude = f"for ({self.index_type} {index} = {begin}; {index} < {end}; ++{index})"
         body = Indented(self.body.cs_format(precision))
 
         # Reduce size of code with lots of simple loops by dropping {} in obviously safe cases
@@ -1603,7 +1639,7 @@ class ForRange(CStatement):
     def __eq__(self, other):
         attributes = ("index", "begin", "end", "body", "index_type")
         return (isinstance(other, type(self))
-                and all(getattr(self, name) == getattr(self, name) for name in attributes))
+                and all(getattr(self, name) == getattr(other, name) for name in attributes))
 
     def flops(self):
         return (self.end.value - self.begin.value) * self.body.flops()
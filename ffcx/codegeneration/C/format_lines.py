@@ -10,6 +10,18 @@ gives O(n^2) behaviour w.r.t. AST size n.
 """
 
 
+# Indentation strings by level, precomputed for the levels that occur in
+# practice
+_indentations = tuple(' ' * (4 * level) for level in range(32))
+
+
+def _indentation(level):
+    """Return the indentation string for the given level."""
+    if level < len(_indentations):
+        return _indentations[level]
+    return ' ' * (4 * level)
+
+
 class Indented(object):
     """Class to mark a collection of snippets for indentation.
 
@@ -39,22 +51,73 @@ def iter_indented_lines(snippets, level=0):
     - tuple,list: Yield lines from recursive application of this function to list items.
 
     """
-    tabsize = 4
-    indentation = ' ' * (tabsize * level)
+    indentation = _indentation(level)
     if isinstance(snippets, str):
         for line in snippets.split("\n"):
             yield indentation + line
     elif isinstance(snippets, Indented):
-        for line in iter_indented_lines(snippets.body, level + 1):
-            yield line
+        yield from iter_indented_lines(snippets.body, level + 1)
     elif isinstance(snippets, (tuple, list)):
         for part in snippets:
-            for line in iter_indented_lines(part, level):
-                yield line
+            yield from iter_indented_lines(part, level)
     else:
         raise RuntimeError("Unexpected type %s:\n%s" % (type(snippets), str(snippets)))
 
 
+def _append_str(snippets, level, lines, stack):
+    if level:
+        indentation = _indentation(level)
+        lines.append(indentation + snippets.replace("\n", "\n" + indentation))
+    else:
+        lines.append(snippets)
+
+
+def _push_indented(snippets, level, lines, stack):
+    stack.append((snippets.body, level + 1))
+
+
+def _push_parts(snippets, level, lines, stack):
+    # Push in reverse to pop parts in order
+    stack.extend([(part, level) for part in reversed(snippets)])
+
+
+# Snippet handlers by exact type, so that each snippet is dispatched
+# with a single dict lookup instead of a chain of isinstance checks
+_snippet_handlers = {
+    str: _append_str,
+    Indented: _push_indented,
+    tuple: _push_parts,
+    list: _push_parts,
+}
+
+
+def _snippet_handler(snippets):
+    """Return the handler for a snippet of a subclass of one of the snippet types."""
+    for cls, handler in _snippet_handlers.items():
+        if isinstance(snippets, cls):
+            return handler
+    raise RuntimeError("Unexpected type %s:\n%s" % (type(snippets), str(snippets)))
+
+
+def _append_indented_lines(snippets, level, lines):
+    """Append indented strings from a snippets data structure to lines.
+
+    Joining lines with newlines afterwards gives the same string as
+    joining iter_indented_lines(snippets, level), but the snippets are traversed
+    with an explicit work list, so deeply nested snippets need neither
+    nested generators nor recursion. Multiline strings are indented with
+    a single replace instead of being split into separate lines.
+
+    """
+    stack = [(snippets, level)]
+    while stack:
+        snippets, level = stack.pop()
+        handler = _snippet_handlers.get(type(snippets)) or _snippet_handler(snippets)
+        handler(snippets, level, lines, stack)
+
+
 def format_indented_lines(snippets, level=0):
     """Format recursive sequences of indented lines as one string."""
-    return "\n".join(iter_indented_lines(snippets, level))
+    lines = []
+    _append_indented_lines(snippets, level, lines)
+    return "\n".join(lines)
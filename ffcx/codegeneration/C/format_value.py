@@ -25,15 +25,40 @@ def format_float(x, precision=None):
             s = "{:.{prec}}".format(float(x), prec=precision)
     else:
         s = repr(float(x))
-    for r, v in _subs:
-        s = r.sub(v, s)
+    if "e" in s:
+        for r, v in _subs:
+            s = r.sub(v, s)
     return s
 
 
+def format_float_array(values, precision=None):
+    """Format the values of a real NumPy array like format_float, returning a list of strings.
+
+    The format specification is built once for the whole array and the
+    exponent cleanup only applied to values formatted with an exponent.
+    """
+    values = values.astype(float, copy=False).ravel().tolist()
+    if precision:
+        spec = f".{precision}"
+        strings = [format(x, spec) for x in values]
+    else:
+        strings = [repr(x) for x in values]
+    for i, s in enumerate(strings):
+        if "e" in s:
+            for r, v in _subs:
+                s = r.sub(v, s)
+            strings[i] = s
+    return strings
+
+
 def format_int(x, precision=None):
     return str(x)
 
 
+def format_bool(x, precision=None):
+    return "true" if x else "false"
+
+
 def format_value(value, precision=None):
     """Format a literal value as s tring.
 
@@ -135,6 +135,12 @@ class UFL2CNodesTranslatorCpp(object):
         self.enable_strength_reduction = False
         self.scalar_type = scalar_type
 
+        # Names of the C math functions for the scalar type
+        self._math_names = math_table.get(scalar_type)
+
+        # Shared literal for zero values
+        self._zero = language.LiteralFloat(0.0)
+
         # Lookup table for handler to call when the "get" method (below) is
         # called, depending on the first argument type.
         self.call_lookup = {ufl.constantvalue.IntValue: self.int_value,
@@ -145,7 +151,7 @@ class UFL2CNodesTranslatorCpp(object):
                             ufl.algebra.Sum: self.sum,
                             ufl.algebra.Division: self.division,
                             ufl.algebra.Abs: self._cmath,
-                            ufl.algebra.Power: self._cmath,
+                            ufl.algebra.Power: self.power,
                             ufl.algebra.Real: self._cmath,
                             ufl.algebra.Imag: self._cmath,
                             ufl.algebra.Conj: self._cmath,
@@ -181,11 +187,10 @@ class UFL2CNodesTranslatorCpp(object):
 
     def get(self, o, *args):
         # Call appropriate handler, depending on the type of o
-        otype = type(o)
-        if otype in self.call_lookup:
-            return self.call_lookup[otype](o, *args)
-        else:
-            raise RuntimeError(f"Missing C formatting rule for expr type {otype}.")
+        handler = self.call_lookup.get(type(o))
+        if handler is None:
+            raise RuntimeError(f"Missing C formatting rule for expr type {type(o)}.")
+        return handler(o, *args)
 
     def expr(self, o, *args):
         """Raise generic fallback with error message for missing rules."""
@@ -194,7 +199,7 @@ class UFL2CNodesTranslatorCpp(object):
     # === Formatting rules for scalar literals ===
 
     def zero(self, o):
-        return self.L.LiteralFloat(0.0)
+        return self._zero
 
     def float_value(self, o):
         return self.L.LiteralFloat(float(o))
@@ -215,6 +220,20 @@ class UFL2CNodesTranslatorCpp(object):
     def product(self, o, a, b):
         return self.L.Mul(a, b)
 
+    def power(self, o, a, b):
+        # Expand small integer powers of cheap operands into products,
+        # avoiding a call to (c)pow. Other operands would be copied
+        # into every factor, so they are left to pow.
+        exponent = o.ufl_operands[1]
+        L = self.L
+        if (isinstance(exponent, ufl.constantvalue.IntValue) and 2 <= int(exponent) <= 4
+                and isinstance(a, (L.Symbol, L.ArrayAccess, L.LiteralFloat, L.LiteralInt))):
+            result = a
+            for i in range(int(exponent) - 1):
+                result = L.Mul(result, a)
+            return result
+        return self._cmath(o, a, b)
+
     def division(self, o, a, b):
         if self.enable_strength_reduction:
             return self.L.Mul(a, self.L.Div(1.0, b))
@@ -262,10 +281,9 @@ class UFL2CNodesTranslatorCpp(object):
 
     def _cmath(self, o, *args):
         k = o._ufl_handler_name_
-        try:
-            name = math_table[self.scalar_type].get(k)
-        except Exception as e:
-            raise type(e)("Math function not found:", self.scalar_type, k)
+        if self._math_names is None:
+            raise KeyError("Math function not found:", self.scalar_type, k)
+        name = self._math_names.get(k)
         if name is None:
             raise RuntimeError("Not supported in current scalar mode")
         return self.L.Call(name, args)
@@ -52,10 +52,12 @@ class FFCXBackendAccess(object):
         handler = self.call_lookup.get(type(e), False)
 
         if not handler:
-            # Look for parent class types instead
+            # Look for parent class types instead, and remember the
+            # result for this type
             for k in self.call_lookup.keys():
                 if isinstance(e, k):
                     handler = self.call_lookup[k]
+                    self.call_lookup[type(e)] = handler
                     break
 
         if handler:
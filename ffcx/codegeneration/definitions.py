@@ -50,16 +50,18 @@ class FFCXBackendDefinitions(object):
         handler = self.call_lookup.get(ttype, False)
 
         if not handler:
-            # Look for parent class types instead
+            # Look for parent class types instead, and remember the
+            # result for this type
             for k in self.call_lookup.keys():
                 if isinstance(t, k):
                     handler = self.call_lookup[k]
+                    self.call_lookup[ttype] = handler
                     break
 
         if handler:
             return handler(t, mt, tabledata, quadrature_rule, access)
         else:
-            raise RuntimeError("Not handled: %s", ttype)
+            raise RuntimeError(f"Not handled: {ttype}")
 
     def coefficient(self, t, mt, tabledata, quadrature_rule, access):
         """Return definition code for coefficients."""
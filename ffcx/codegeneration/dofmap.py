@@ -9,7 +9,9 @@
 
 import logging
 
+import ffcx.codegeneration.C.cnodes as L
 import ffcx.codegeneration.dofmap_template as ufc_dofmap
+from ffcx.codegeneration.templating import render, template_fields
 
 logger = logging.getLogger("ffcx")
 
@@ -35,10 +37,8 @@ def tabulate_entity_dofs(L, entity_dofs, num_dofs_per_entity):
 
         # Generate cases for each mesh entity
         cases = []
-        for entity in range(len(entity_dofs[dim])):
-            casebody = []
-            for (j, dof) in enumerate(entity_dofs[dim][entity]):
-                casebody += [L.Assign(dofs[j], dof)]
+        for entity, dofs_of_entity in enumerate(entity_dofs[dim]):
+            casebody = [L.Assign(dofs[j], dof) for j, dof in enumerate(dofs_of_entity)]
             cases.append((entity, L.StatementList(casebody)))
 
         # Generate inner switch
@@ -67,18 +67,16 @@ def generator(ir, parameters):
     d["num_element_support_dofs"] = ir.num_element_support_dofs
     d["num_sub_dofmaps"] = ir.num_sub_dofmaps
 
-    import ffcx.codegeneration.C.cnodes as L
-
     num_entity_dofs = ir.num_entity_dofs + [0, 0, 0, 0]
     num_entity_dofs = num_entity_dofs[:4]
     d["num_entity_dofs"] = f"num_entity_dofs_{ir.name}"
-    d["num_entity_dofs_init"] = L.ArrayDecl("int", f"num_entity_dofs_{ir.name}",
+    d["num_entity_dofs_init"] = L.ArrayDecl("static int", f"num_entity_dofs_{ir.name}",
                                             values=num_entity_dofs, sizes=4)
 
     num_entity_closure_dofs = ir.num_entity_closure_dofs + [0, 0, 0, 0]
     num_entity_closure_dofs = num_entity_closure_dofs[:4]
     d["num_entity_closure_dofs"] = f"num_entity_closure_dofs_{ir.name}"
-    d["num_entity_closure_dofs_init"] = L.ArrayDecl("int", f"num_entity_closure_dofs_{ir.name}",
+    d["num_entity_closure_dofs_init"] = L.ArrayDecl("static int", f"num_entity_closure_dofs_{ir.name}",
                                                     values=num_entity_closure_dofs, sizes=4)
 
     d["block_size"] = ir.block_size
@@ -87,9 +85,9 @@ def generator(ir, parameters):
     d["tabulate_entity_dofs"] = tabulate_entity_dofs(L, *ir.tabulate_entity_dofs)
     d["tabulate_entity_closure_dofs"] = tabulate_entity_dofs(L, *ir.tabulate_entity_closure_dofs)
 
-    if len(ir.sub_dofmaps) > 0:
+    if ir.sub_dofmaps:
         d["sub_dofmaps_initialization"] = L.ArrayDecl(
-            "ufc_dofmap*", f"sub_dofmaps_{ir.name}",
+            "static ufc_dofmap*", f"sub_dofmaps_{ir.name}",
             values=[L.AddressOf(L.Symbol(dofmap)) for dofmap in ir.sub_dofmaps], sizes=len(ir.sub_dofmaps))
         d["sub_dofmaps"] = f"sub_dofmaps_{ir.name}"
     else:
@@ -97,17 +95,13 @@ def generator(ir, parameters):
         d["sub_dofmaps"] = "NULL"
 
     # Check that no keys are redundant or have been missed
-    from string import Formatter
-    fields = [fname for _, fname, _, _ in Formatter().parse(ufc_dofmap.factory) if fname]
-    # Remove square brackets from any field names
-    fields = [f.split("[")[0] for f in fields]
-    assert set(fields) == set(
+    assert template_fields(ufc_dofmap.factory) == set(
         d.keys()), "Mismatch between keys in template and in formattting dict."
 
     # Format implementation code
-    implementation = ufc_dofmap.factory.format_map(d)
+    implementation = render(ufc_dofmap.factory, d)
 
     # Format declaration
-    declaration = ufc_dofmap.declaration.format(factory_name=ir.name)
+    declaration = render(ufc_dofmap.declaration, {"factory_name": ir.name})
 
     return declaration, implementation
@@ -14,6 +14,7 @@ from ffcx.codegeneration import expressions_template
 from ffcx.codegeneration.backend import FFCXBackend
 from ffcx.codegeneration.C.format_lines import format_indented_lines
 from ffcx.codegeneration.C.cnodes import CNode
+from ffcx.codegeneration.templating import render, template_fields
 from ffcx.ir.representation import ir_expression
 
 logger = logging.getLogger("ffcx")
@@ -28,7 +29,7 @@ def generator(ir, parameters):
     factory_name = ir.name
 
     # Format declaration
-    declaration = expressions_template.declaration.format(factory_name=factory_name)
+    declaration = render(expressions_template.declaration, {"factory_name": factory_name})
 
     backend = FFCXBackend(ir, parameters)
     L = backend.language
@@ -41,7 +42,7 @@ def generator(ir, parameters):
     body = format_indented_lines(parts.cs_format(), 1)
     d["tabulate_expression"] = body
 
-    if len(ir.original_coefficient_positions) > 0:
+    if ir.original_coefficient_positions:
         d["original_coefficient_positions"] = f"original_coefficient_positions_{ir.name}"
         d["original_coefficient_positions_init"] = L.ArrayDecl(
             "static int", f"original_coefficient_positions_{ir.name}",
@@ -54,7 +55,7 @@ def generator(ir, parameters):
         "static double", f"points_{ir.name}", values=ir.points.flatten(), sizes=ir.points.size)
     d["points"] = L.Symbol(f"points_{ir.name}")
 
-    if len(ir.expression_shape) > 0:
+    if ir.expression_shape:
         d["value_shape_init"] = L.ArrayDecl(
             "static int", f"value_shape_{ir.name}", values=ir.expression_shape, sizes=len(ir.expression_shape))
         d["value_shape"] = f"value_shape_{ir.name}"
@@ -70,13 +71,11 @@ def generator(ir, parameters):
     d["scalar_type"] = parameters["scalar_type"]
 
     # Check that no keys are redundant or have been missed
-    from string import Formatter
-    fields = [fname for _, fname, _, _ in Formatter().parse(expressions_template.factory) if fname]
-
-    assert set(fields) == set(d.keys()), "Mismatch between keys in template and in formattting dict"
+    assert template_fields(expressions_template.factory) == set(
+        d.keys()), "Mismatch between keys in template and in formattting dict"
 
     # Format implementation code
-    implementation = expressions_template.factory.format_map(d)
+    implementation = render(expressions_template.factory, d)
 
     return declaration, implementation
 
@@ -84,7 +83,7 @@ def generator(ir, parameters):
 class ExpressionGenerator:
     def __init__(self, ir: ir_expression, backend: FFCXBackend):
 
-        if len(list(ir.integrand.keys())) != 1:
+        if len(ir.integrand) != 1:
             raise RuntimeError("Only one set of points allowed for expression evaluation")
 
         self.ir = ir
@@ -93,7 +92,7 @@ class ExpressionGenerator:
         self._ufl_names: Set[Any] = set()
         self.symbol_counters: DefaultDict[Any, int] = collections.defaultdict(int)
         self.shared_symbols: Dict[Any, Any] = {}
-        self.quadrature_rule = list(self.ir.integrand.keys())[0]
+        self.quadrature_rule = next(iter(self.ir.integrand))
 
     def generate(self):
         L = self.backend.language
@@ -345,7 +344,7 @@ class ExpressionGenerator:
     def new_temp_symbol(self, basename):
         """Create a new code symbol named basename + running counter."""
         L = self.backend.language
-        name = "%s%d" % (basename, self.symbol_counters[basename])
+        name = f"{basename}{self.symbol_counters[basename]}"
         self.symbol_counters[basename] += 1
         return L.Symbol(name)
 
@@ -365,9 +364,8 @@ class ExpressionGenerator:
 
         use_symbol_array = True
 
-        for i, attr in F.nodes.items():
-            if attr['status'] != mode:
-                continue
+        for i in F.partitions[mode]:
+            attr = F.nodes[i]
             v = attr['expression']
             mt = attr.get('mt')
 
@@ -431,7 +429,7 @@ class ExpressionGenerator:
                         intermediates.append(L.Assign(vaccess, vexpr))
                     else:
                         scalar_type = self.backend.access.parameters["scalar_type"]
-                        vaccess = L.Symbol("%s_%d" % (symbol.name, j))
+                        vaccess = L.Symbol(f"{symbol.name}_{j}")
                         intermediates.append(L.VariableDecl(f"const {scalar_type}", vaccess, vexpr))
 
             # Store access node for future reference
@@ -450,6 +448,7 @@ class ExpressionGenerator:
         if intermediates:
             if use_symbol_array:
                 scalar_type = self.backend.access.parameters["scalar_type"]
-                parts += [L.ArrayDecl(scalar_type, symbol, len(intermediates))]
+                padlen = self.ir.params["padlen"]
+                parts += [L.ArrayDecl(scalar_type, symbol, len(intermediates), padlen=padlen)]
             parts += intermediates
         return parts
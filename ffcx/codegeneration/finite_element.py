@@ -10,7 +10,9 @@
 
 import logging
 
+import ffcx.codegeneration.C.cnodes as L
 import ffcx.codegeneration.finite_element_template as ufc_finite_element
+from ffcx.codegeneration.templating import render, template_fields
 import ufl
 
 logger = logging.getLogger("ffcx")
@@ -33,9 +35,11 @@ def generator(ir, parameters):
     d["cell_shape"] = ir.cell_shape
     d["element_type"] = ir.element_type
     d["space_dimension"] = ir.space_dimension
-    d["value_rank"] = len(ir.value_shape)
+    value_rank = len(ir.value_shape)
+    reference_value_rank = len(ir.reference_value_shape)
+    d["value_rank"] = value_rank
     d["value_size"] = ufl.product(ir.value_shape)
-    d["reference_value_rank"] = len(ir.reference_value_shape)
+    d["reference_value_rank"] = reference_value_rank
     d["reference_value_size"] = ufl.product(ir.reference_value_shape)
     d["degree"] = ir.degree
     d["family"] = f"\"{ir.family}\""
@@ -57,46 +61,39 @@ def generator(ir, parameters):
     else:
         d["basix_cell"] = int(ir.basix_cell)
 
-    import ffcx.codegeneration.C.cnodes as L
+    if value_rank > 0:
+        name = f"value_shape_{ir.name}"
+        d["value_shape"] = name
+        d["value_shape_init"] = L.ArrayDecl("static int", name, values=ir.value_shape, sizes=value_rank)
 
-    if len(ir.value_shape) > 0:
-        d["value_shape"] = f"value_shape_{ir.name}"
-        d["value_shape_init"] = L.ArrayDecl(
-            "int", f"value_shape_{ir.name}", values=ir.value_shape, sizes=len(ir.value_shape))
+        name = f"reference_value_shape_{ir.name}"
+        d["reference_value_shape"] = name
+        d["reference_value_shape_init"] = L.ArrayDecl(
+            "static int", name, values=ir.reference_value_shape, sizes=reference_value_rank)
     else:
         d["value_shape"] = "NULL"
         d["value_shape_init"] = ""
-
-    if len(ir.value_shape) > 0:
-        d["reference_value_shape"] = f"reference_value_shape_{ir.name}"
-        d["reference_value_shape_init"] = L.ArrayDecl(
-            "int", f"reference_value_shape_{ir.name}",
-            values=ir.reference_value_shape, sizes=len(ir.reference_value_shape))
-    else:
         d["reference_value_shape"] = "NULL"
         d["reference_value_shape_init"] = ""
 
-    if len(ir.sub_elements) > 0:
-        d["sub_elements"] = f"sub_elements_{ir.name}"
+    if ir.sub_elements:
+        name = f"sub_elements_{ir.name}"
+        d["sub_elements"] = name
         d["sub_elements_init"] = L.ArrayDecl(
-            "ufc_finite_element*", f"sub_elements_{ir.name}",
+            "static ufc_finite_element*", name,
             values=[L.AddressOf(L.Symbol(el)) for el in ir.sub_elements], sizes=len(ir.sub_elements))
     else:
         d["sub_elements"] = "NULL"
         d["sub_elements_init"] = ""
 
     # Check that no keys are redundant or have been missed
-    from string import Formatter
-    fieldnames = [
-        fname for _, fname, _, _ in Formatter().parse(ufc_finite_element.factory) if fname
-    ]
-    assert set(fieldnames) == set(
+    assert template_fields(ufc_finite_element.factory) == set(
         d.keys()), "Mismatch between keys in template and in formattting dict"
 
     # Format implementation code
-    implementation = ufc_finite_element.factory.format_map(d)
+    implementation = render(ufc_finite_element.factory, d)
 
     # Format declaration
-    declaration = ufc_finite_element.declaration.format(factory_name=ir.name)
+    declaration = render(ufc_finite_element.declaration, {"factory_name": ir.name})
 
     return declaration, implementation
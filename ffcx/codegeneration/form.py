@@ -9,7 +9,9 @@
 
 import logging
 
+import ffcx.codegeneration.C.cnodes as L
 from ffcx.codegeneration import form_template
+from ffcx.codegeneration.templating import render, template_fields
 
 logger = logging.getLogger("ffcx")
 
@@ -20,8 +22,6 @@ def generator(ir, parameters):
     logger.info(f"--- rank: {ir.rank}")
     logger.info(f"--- name: {ir.name}")
 
-    import ffcx.codegeneration.C.cnodes as L
-
     d = {}
     d["factory_name"] = ir.name
     d["name_from_uflfile"] = ir.name_from_uflfile
@@ -30,18 +30,15 @@ def generator(ir, parameters):
     d["num_coefficients"] = ir.num_coefficients
     d["num_constants"] = ir.num_constants
 
-    code = []
-    cases = []
-    for itg_type in ("cell", "interior_facet", "exterior_facet"):
-        cases += [(L.Symbol(itg_type), L.Return(len(ir.subdomain_ids[itg_type])))]
-    code += [L.Switch("integral_type", cases, default=L.Return(0))]
-    d["num_integrals"] = L.StatementList(code)
+    cases = [(L.Symbol(itg_type), L.Return(len(ir.subdomain_ids[itg_type])))
+             for itg_type in ("cell", "interior_facet", "exterior_facet")]
+    d["num_integrals"] = L.StatementList([L.Switch("integral_type", cases, default=L.Return(0))])
 
-    if len(ir.original_coefficient_position) > 0:
+    if ir.original_coefficient_position:
+        name = f"original_coefficient_position_{ir.name}"
         d["original_coefficient_position_init"] = L.ArrayDecl(
-            "int", f"original_coefficient_position_{ir.name}",
-            values=ir.original_coefficient_position, sizes=len(ir.original_coefficient_position))
-        d["original_coefficient_position"] = f"original_coefficient_position_{ir.name}"
+            "static int", name, values=ir.original_coefficient_position, sizes=len(ir.original_coefficient_position))
+        d["original_coefficient_position"] = name
     else:
         d["original_coefficient_position_init"] = ""
         d["original_coefficient_position"] = L.Null()
@@ -49,7 +46,7 @@ def generator(ir, parameters):
     cnames = ir.coefficient_names
     assert ir.num_coefficients == len(cnames)
     names = L.Symbol("names")
-    if (len(cnames) == 0):
+    if not cnames:
         code = [L.Return(L.Null())]
     else:
         code = [L.ArrayDecl("static const char*", names, len(cnames), cnames)]
@@ -58,25 +55,27 @@ def generator(ir, parameters):
 
     cstnames = ir.constant_names
     names = L.Symbol("names")
-    if len(cstnames) == 0:
+    if not cstnames:
         code = [L.Return(L.Null())]
     else:
         code = [L.ArrayDecl("static const char*", names, len(cstnames), cstnames)]
         code += [L.Return(names)]
     d["constant_name_map"] = L.StatementList(code)
 
-    if len(ir.finite_elements) > 0:
-        d["finite_elements"] = f"finite_elements_{ir.name}"
-        d["finite_elements_init"] = L.ArrayDecl("ufc_finite_element*", f"finite_elements_{ir.name}", values=[
+    if ir.finite_elements:
+        name = f"finite_elements_{ir.name}"
+        d["finite_elements"] = name
+        d["finite_elements_init"] = L.ArrayDecl("static ufc_finite_element*", name, values=[
                                                 L.AddressOf(L.Symbol(el)) for el in ir.finite_elements],
                                                 sizes=len(ir.finite_elements))
     else:
         d["finite_elements"] = L.Null()
         d["finite_elements_init"] = ""
 
-    if len(ir.dofmaps) > 0:
-        d["dofmaps"] = f"dofmaps_{ir.name}"
-        d["dofmaps_init"] = L.ArrayDecl("ufc_dofmap*", f"dofmaps_{ir.name}", values=[
+    if ir.dofmaps:
+        name = f"dofmaps_{ir.name}"
+        d["dofmaps"] = name
+        d["dofmaps_init"] = L.ArrayDecl("static ufc_dofmap*", name, values=[
             L.AddressOf(L.Symbol(dofmap)) for dofmap in ir.dofmaps], sizes=len(ir.dofmaps))
     else:
         d["dofmaps"] = L.Null()
@@ -87,17 +86,21 @@ def generator(ir, parameters):
     code_ids = []
     cases_ids = []
     for itg_type in ("cell", "interior_facet", "exterior_facet"):
-        if len(ir.integral_names[itg_type]) > 0:
+        integral_names = ir.integral_names[itg_type]
+        if integral_names:
+            itg_type_symbol = L.Symbol(itg_type)
+            integrals = L.Symbol(f"integrals_{itg_type}_{ir.name}")
             code += [L.ArrayDecl(
-                "static ufc_integral*", f"integrals_{itg_type}_{ir.name}",
-                values=[L.AddressOf(L.Symbol(itg)) for itg in ir.integral_names[itg_type]],
-                sizes=len(ir.integral_names[itg_type]))]
-            cases.append((L.Symbol(itg_type), L.Return(L.Symbol(f"integrals_{itg_type}_{ir.name}"))))
+                "static ufc_integral*", integrals,
+                values=[L.AddressOf(L.Symbol(itg)) for itg in integral_names],
+                sizes=len(integral_names))]
+            cases.append((itg_type_symbol, L.Return(integrals)))
 
+            subdomain_ids = ir.subdomain_ids[itg_type]
+            integral_ids = L.Symbol(f"integral_ids_{itg_type}_{ir.name}")
             code_ids += [L.ArrayDecl(
-                "static int", f"integral_ids_{itg_type}_{ir.name}",
-                values=ir.subdomain_ids[itg_type], sizes=len(ir.subdomain_ids[itg_type]))]
-            cases_ids.append((L.Symbol(itg_type), L.Return(L.Symbol(f"integral_ids_{itg_type}_{ir.name}"))))
+                "static int", integral_ids, values=subdomain_ids, sizes=len(subdomain_ids))]
+            cases_ids.append((itg_type_symbol, L.Return(integral_ids)))
 
     code += [L.Switch("integral_type", cases, default=L.Return(L.Null()))]
     code_ids += [L.Switch("integral_type", cases_ids, default=L.Return(L.Null()))]
@@ -111,35 +114,34 @@ def generator(ir, parameters):
     # FIXME: Should be handled differently, revise how
     # ufc_function_space is generated
     for (name, (element, dofmap, cmap_family, cmap_degree)) in ir.function_spaces.items():
-        code += [f"static ufc_function_space functionspace_{name} ="]
-        code += ["{"]
-        code += [f".finite_element = &{element},"]
-        code += [f".dofmap = &{dofmap},"]
-        code += [f".geometry_family = \"{cmap_family}\","]
-        code += [f".geometry_degree = {cmap_degree}"]
-        code += ["};"]
-
-    for i, (name, (element, dofmap, cmap_family, cmap_degree)) in enumerate(ir.function_spaces.items()):
+        code.extend([f"static ufc_function_space functionspace_{name} =",
+                     "{",
+                     f".finite_element = &{element},",
+                     f".dofmap = &{dofmap},",
+                     f".geometry_family = \"{cmap_family}\",",
+                     f".geometry_degree = {cmap_degree}",
+                     "};"])
+
+    for i, name in enumerate(ir.function_spaces):
         condition = L.EQ(L.Call("strcmp", (function_name, L.LiteralString(name))), 0)
+        body = L.Return(L.Symbol(f"&functionspace_{name}"))
         if i == 0:
-            code += [L.If(condition, L.Return(L.Symbol(f"&functionspace_{name}")))]
+            code += [L.If(condition, body)]
         else:
-            code += [L.ElseIf(condition, L.Return(L.Symbol(f"&functionspace_{name}")))]
+            code += [L.ElseIf(condition, body)]
 
     code += ["return NULL;\n"]
 
     d["functionspace"] = L.StatementList(code)
 
     # Check that no keys are redundant or have been missed
-    from string import Formatter
-    fields = [fname for _, fname, _, _ in Formatter().parse(form_template.factory) if fname]
-    assert set(fields) == set(d.keys()), "Mismatch between keys in template and in formattting dict"
+    assert template_fields(form_template.factory) == set(
+        d.keys()), "Mismatch between keys in template and in formattting dict"
 
     # Format implementation code
-    implementation = form_template.factory.format_map(d)
+    implementation = render(form_template.factory, d)
 
     # Format declaration
-    declaration = form_template.declaration.format(factory_name=d["factory_name"],
-                                                   name_from_uflfile=d["name_from_uflfile"])
+    declaration = render(form_template.declaration, d)
 
     return declaration, implementation
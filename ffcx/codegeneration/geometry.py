@@ -78,7 +78,7 @@ def reference_edge_vectors(L, tablename, cellname):
 
     edge_vectors = [geometry[j] - geometry[i] for i, j in topology[1]]
 
-    out = numpy.array(edge_vectors[cellname])
+    out = numpy.array(edge_vectors)
     return L.ArrayDecl("static const double", f"{cellname}_{tablename}", out.shape, out)
 
 
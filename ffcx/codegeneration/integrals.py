@@ -6,7 +6,7 @@
 
 import collections
 import logging
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import ufl
 from ffcx.codegeneration import geometry
@@ -14,6 +14,7 @@ from ffcx.codegeneration import integrals_template as ufc_integrals
 from ffcx.codegeneration.backend import FFCXBackend
 from ffcx.codegeneration.C.format_lines import format_indented_lines
 from ffcx.codegeneration.C.cnodes import CNode, BinOp
+from ffcx.codegeneration.templating import render
 from ffcx.ir.elementtables import piecewise_ttypes
 from ffcx.ir.integral import block_data_t
 from ffcx.ir.representationutils import QuadratureRule
@@ -31,7 +32,7 @@ def generator(ir, parameters):
     factory_name = ir.name
 
     # Format declaration
-    declaration = ufc_integrals.declaration.format(factory_name=factory_name)
+    declaration = render(ufc_integrals.declaration, {"factory_name": factory_name})
 
     # Create FFCx C backend
     backend = FFCXBackend(ir, parameters)
@@ -56,9 +57,9 @@ def generator(ir, parameters):
     code["destructor"] = ""
 
     L = backend.language
-    if len(ir.enabled_coefficients) > 0:
+    if ir.enabled_coefficients:
         code["enabled_coefficients_init"] = L.ArrayDecl(
-            "bool", f"enabled_coefficients_{ir.name}",
+            "static bool", f"enabled_coefficients_{ir.name}",
             values=ir.enabled_coefficients, sizes=len(ir.enabled_coefficients))
         code["enabled_coefficients"] = f"enabled_coefficients_{ir.name}"
     else:
@@ -71,7 +72,7 @@ def generator(ir, parameters):
     if parameters["tabulate_tensor_void"]:
         code["tabulate_tensor"] = ""
 
-    implementation = ufc_integrals.factory.format(
+    implementation = render(ufc_integrals.factory, dict(
         factory_name=factory_name,
         enabled_coefficients=code["enabled_coefficients"],
         enabled_coefficients_init=code["enabled_coefficients_init"],
@@ -79,7 +80,7 @@ def generator(ir, parameters):
         needs_facet_permutations="true" if ir.needs_facet_permutations else "false",
         scalar_type=parameters["scalar_type"],
         np_scalar_type=cdtype_to_numpy(parameters["scalar_type"]),
-        coordinate_element=L.AddressOf(L.Symbol(ir.coordinate_element)))
+        coordinate_element=L.AddressOf(L.Symbol(ir.coordinate_element))))
 
     return declaration, implementation
 
@@ -148,7 +149,7 @@ class IntegralGenerator(object):
     def new_temp_symbol(self, basename):
         """Create a new code symbol named basename + running counter."""
         L = self.backend.language
-        name = "%s%d" % (basename, self.symbol_counters[basename])
+        name = f"{basename}{self.symbol_counters[basename]}"
         self.symbol_counters[basename] += 1
         return L.Symbol(name)
 
@@ -161,6 +162,17 @@ class IntegralGenerator(object):
             self.shared_symbols[key] = s
         return s, defined
 
+    def table_typename(self):
+        """Return the type of static tables of precomputed values.
+
+        If an alignment of the kernel arguments is assumed, the tables
+        are given the same alignment.
+        """
+        alignment = self.ir.params["assume_aligned"]
+        if alignment != -1:
+            return f"static alignas({alignment}) const double"
+        return "static const double"
+
     def generate(self):
         """Generate entire tabulate_tensor body.
 
@@ -228,6 +240,7 @@ class IntegralGenerator(object):
             return parts
 
         padlen = self.ir.params["padlen"]
+        typename = self.table_typename()
 
         # Loop over quadrature rules
         for quadrature_rule, integrand in self.ir.integrand.items():
@@ -237,7 +250,7 @@ class IntegralGenerator(object):
             wsym = self.backend.symbols.weights_table(quadrature_rule)
             parts += [
                 L.ArrayDecl(
-                    "static const double", wsym, num_points,
+                    typename, wsym, num_points,
                     quadrature_rule.weights, padlen=padlen)
             ]
 
@@ -314,7 +327,7 @@ class IntegralGenerator(object):
         L = self.backend.language
 
         return [L.ArrayDecl(
-            "static const double", name, table.shape, table, padlen=padlen)]
+            self.table_typename(), name, table.shape, table, padlen=padlen)]
 
     def generate_quadrature_loop(self, quadrature_rule: QuadratureRule):
         """Generate quadrature loop with for this quadrature_rule."""
@@ -382,17 +395,23 @@ class IntegralGenerator(object):
 
         use_symbol_array = True
 
-        for i, attr in F.nodes.items():
-            if attr['status'] != mode:
-                continue
+        # Bind backend lookups used for every node
+        get_var = self.get_var
+        ufl_to_language = self.backend.ufl_to_language.get
+        terminal_access = self.backend.access.get
+        terminal_definitions = self.backend.definitions.get
+        scalar_type = self.backend.access.parameters["scalar_type"]
+
+        for i in F.partitions[mode]:
+            attr = F.nodes[i]
             v = attr['expression']
             mt = attr.get('mt')
 
             # Generate code only if the expression is not already in
             # cache
-            if not self.get_var(quadrature_rule, v):
+            if not get_var(quadrature_rule, v):
                 if v._ufl_is_literal_:
-                    vaccess = self.backend.ufl_to_language.get(v)
+                    vaccess = ufl_to_language(v)
                 elif mt is not None:
                     # All finite element based terminals have table
                     # data, as well as some, but not all, of the
@@ -400,10 +419,9 @@ class IntegralGenerator(object):
                     tabledata = attr.get('tr')
 
                     # Backend specific modified terminal translation
-                    vaccess = self.backend.access.get(mt.terminal, mt, tabledata, quadrature_rule)
+                    vaccess = terminal_access(mt.terminal, mt, tabledata, quadrature_rule)
                     if isinstance(mt.terminal, ufl.Coefficient):
-                        vdef, predef = self.backend.definitions.get(
-                            mt.terminal, mt, tabledata, quadrature_rule, vaccess)
+                        vdef, predef = terminal_definitions(mt.terminal, mt, tabledata, quadrature_rule, vaccess)
                         assert isinstance(predef, list)
                         if predef:
                             access = predef[0].symbol.name
@@ -411,14 +429,14 @@ class IntegralGenerator(object):
                                 predef, "Auxiliary array to enable unit-stride access in coefficient computations.")
                             pre_definitions[str(access)] = predef
                     else:
-                        vdef = self.backend.definitions.get(mt.terminal, mt, tabledata, quadrature_rule, vaccess)
+                        vdef = terminal_definitions(mt.terminal, mt, tabledata, quadrature_rule, vaccess)
 
                     # Store definitions of terminals in list
                     assert isinstance(vdef, list)
                     definitions[str(vaccess)] = vdef
                 else:
                     # Get previously visited operands
-                    vops = [self.get_var(quadrature_rule, op) for op in v.ufl_operands]
+                    vops = [get_var(quadrature_rule, op) for op in v.ufl_operands]
 
                     # get parent operand
                     pid = F.in_edges[i][0] if F.in_edges[i] else -1
@@ -429,7 +447,7 @@ class IntegralGenerator(object):
 
                     # Mapping UFL operator to target language
                     self._ufl_names.add(v._ufl_handler_name_)
-                    vexpr = self.backend.ufl_to_language.get(v, *vops)
+                    vexpr = ufl_to_language(v, *vops)
 
                     # Create a new intermediate for each subexpression
                     # except boolean conditions and its childs
@@ -456,8 +474,7 @@ class IntegralGenerator(object):
                             vaccess = symbol[j]
                             intermediates.append(L.Assign(vaccess, vexpr))
                         else:
-                            scalar_type = self.backend.access.parameters["scalar_type"]
-                            vaccess = L.Symbol("%s_%d" % (symbol.name, j))
+                            vaccess = L.Symbol(f"{symbol.name}_{j}")
                             intermediates.append(L.VariableDecl(f"const {scalar_type}", vaccess, vexpr))
 
                 # Store access node for future reference
@@ -474,8 +491,7 @@ class IntegralGenerator(object):
         if intermediates:
             if use_symbol_array:
                 padlen = self.ir.params["padlen"]
-                parts += [L.ArrayDecl(self.backend.access.parameters["scalar_type"],
-                                      symbol, len(intermediates), padlen=padlen)]
+                parts += [L.ArrayDecl(scalar_type, symbol, len(intermediates), padlen=padlen)]
             parts += intermediates
         return preparts, parts
 
@@ -515,10 +531,10 @@ class IntegralGenerator(object):
 
     def get_arg_factors(self, blockdata, block_rank, quadrature_rule, iq, indices):
         arg_factors = []
+        scope = self.ir.integrand[quadrature_rule]["modified_arguments"]
         for i in range(block_rank):
             mad = blockdata.ma_data[i]
             td = mad.tabledata
-            scope = self.ir.integrand[quadrature_rule]["modified_arguments"]
             mt = scope[mad.ma_index]
 
             # Translate modified terminal to code
@@ -562,10 +578,22 @@ class IntegralGenerator(object):
         # Override dof index with quadrature loop index for arguments
         # with quadrature element, to index B like B[iq*num_dofs + iq]
         arg_indices = tuple(self.backend.symbols.argument_loop_index(i) for i in range(block_rank))
-        B_indices = []
-        for i in range(block_rank):
-            B_indices.append(arg_indices[i])
-        B_indices = list(B_indices)
+        B_indices = list(arg_indices)
+
+        # Get factorization graph for this quadrature rule
+        F = self.ir.integrand[quadrature_rule]["factorization"]
+
+        # Quadrature weight was removed in representation, add it back
+        # when defining fw below
+        if self.ir.integral_type in ufl.custom_integral_types:
+            weights = self.backend.symbols.custom_weights_table()
+        else:
+            weights = self.backend.symbols.weights_table(quadrature_rule)
+        weight = weights[iq]
+
+        A_shape = self.ir.tensor_shape
+        Asym = self.backend.symbols.element_tensor()
+        A = L.FlattenedArray(Asym, dims=A_shape)
 
         for blockdata in blocklist:
             ttypes = blockdata.ttypes
@@ -579,19 +607,9 @@ class IntegralGenerator(object):
             factor_index = blockdata.factor_indices_comp_indices[0][0]
 
             # Get factor expression
-            F = self.ir.integrand[quadrature_rule]["factorization"]
-
             v = F.nodes[factor_index]['expression']
             f = self.get_var(quadrature_rule, v)
 
-            # Quadrature weight was removed in representation, add it back now
-            if self.ir.integral_type in ufl.custom_integral_types:
-                weights = self.backend.symbols.custom_weights_table()
-                weight = weights[iq]
-            else:
-                weights = self.backend.symbols.weights_table(quadrature_rule)
-                weight = weights[iq]
-
             # Define fw = f * weight
             fw_rhs = L.float_product([f, weight])
             if not isinstance(fw_rhs, L.Product):
@@ -605,10 +623,6 @@ class IntegralGenerator(object):
                     quadparts.append(L.VariableDecl(f"const {scalar_type}", fw, fw_rhs))
 
             assert not blockdata.transposed, "Not handled yet"
-            A_shape = self.ir.tensor_shape
-
-            Asym = self.backend.symbols.element_tensor()
-            A = L.FlattenedArray(Asym, dims=A_shape)
 
             # Fetch code to access modified arguments
             arg_factors = self.get_arg_factors(blockdata, block_rank, quadrature_rule, iq, B_indices)
@@ -616,14 +630,12 @@ class IntegralGenerator(object):
             B_rhs = L.float_product([fw] + arg_factors)
 
             A_indices = []
-            for i in range(block_rank):
-                offset = blockdata.ma_data[i].tabledata.offset
-                index = arg_indices[i]
-                if len(blockmap[i]) == 1:
-                    A_indices.append(index + offset)
+            for index, dofmap, mad in zip(arg_indices, blockmap, blockdata.ma_data):
+                td = mad.tabledata
+                if len(dofmap) == 1:
+                    A_indices.append(index + td.offset)
                 else:
-                    block_size = blockdata.ma_data[i].tabledata.block_size
-                    A_indices.append(block_size * index + offset)
+                    A_indices.append(td.block_size * index + td.offset)
             rhs_expressions[tuple(A_indices)].append(B_rhs)
 
         # List of statements to keep in the inner loop
@@ -632,6 +644,9 @@ class IntegralGenerator(object):
         pre_loop: List[CNode] = []
         # List of loop invariant expressions to hoist
         hoist: List[BinOp] = []
+        padlen = self.ir.params["padlen"]
+        # Temporaries of hoisted expressions, keyed by their generated code
+        hoisted: Dict[str, CNode] = {}
 
         for indices in rhs_expressions:
             hoist_rhs = collections.defaultdict(list)
@@ -659,19 +674,16 @@ class IntegralGenerator(object):
                         sum.append(L.float_product(rhs))
                     sum = L.Sum(sum)
 
-                    lhs = None
-                    for h in hoist:
-                        if (h.rhs == sum):
-                            lhs = h.lhs
-                            break
-                    if lhs:
-                        keep[indices].append(L.float_product([statement, lhs]))
-                    else:
+                    # Reuse the temporary of an identical hoisted expression
+                    key = sum.ce_format(self.ir.precision)
+                    lhs = hoisted.get(key)
+                    if lhs is None:
                         t = self.new_temp_symbol("t")
                         scalar_type = self.backend.access.parameters["scalar_type"]
-                        pre_loop.append(L.ArrayDecl(scalar_type, t, blockdims[0]))
-                        keep[indices].append(L.float_product([statement, t[B_indices[0]]]))
-                        hoist.append(L.Assign(t[B_indices[i - 1]], sum))
+                        pre_loop.append(L.ArrayDecl(scalar_type, t, blockdims[0], padlen=padlen))
+                        lhs = hoisted[key] = t[B_indices[0]]
+                        hoist.append(L.Assign(lhs, sum))
+                    keep[indices].append(L.float_product([statement, lhs]))
             else:
                 keep[indices] = rhs_expressions[indices]
 
@@ -683,8 +695,14 @@ class IntegralGenerator(object):
             sum = L.Sum(keep[indices])
             body.append(L.AssignAdd(A[indices], sum))
 
+        # The iterations of the innermost loop update distinct entries
+        # of A, so let OpenMP vectorise it when enabled
         for i in reversed(range(block_rank)):
-            body = [L.ForRange(B_indices[i], 0, blockdims[i], body=body)]
+            loop = L.ForRange(B_indices[i], 0, blockdims[i], body=body)
+            if i == block_rank - 1:
+                body = [L.VerbatimStatement("#ifdef _OPENMP\n#pragma omp simd\n#endif"), loop]
+            else:
+                body = [loop]
 
         quadparts += pre_loop
         quadparts += hoist_code
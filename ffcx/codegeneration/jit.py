@@ -23,25 +23,38 @@ logger = logging.getLogger("ffcx")
 # Get declarations directly from ufc.h
 file_dir = os.path.dirname(os.path.abspath(__file__))
 with open(file_dir + "/ufc.h", "r") as f:
-    ufc_h = ''.join(f.readlines())
+    ufc_h = f.read()
 
 header = ufc_h.split("<HEADER_DECL>")[1].split("</HEADER_DECL>")[0].strip(" /\n")
 header = header.replace("{", "{{").replace("}", "}}")
 UFC_HEADER_DECL = header + "\n"
 
-UFC_ELEMENT_DECL = '\n'.join(re.findall('typedef struct ufc_finite_element.*?ufc_finite_element;', ufc_h, re.DOTALL))
-UFC_DOFMAP_DECL = '\n'.join(re.findall('typedef struct ufc_dofmap.*?ufc_dofmap;', ufc_h, re.DOTALL))
-UFC_FORM_DECL = '\n'.join(re.findall('typedef struct ufc_form.*?ufc_form;', ufc_h, re.DOTALL))
 
-UFC_INTEGRAL_DECL = '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_float32\).*?\);', ufc_h, re.DOTALL))
-UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_float64\).*?\);', ufc_h, re.DOTALL))
-UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_complex64\).*?\);', ufc_h, re.DOTALL))
-UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_complex128\).*?\);', ufc_h, re.DOTALL))
-UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_longdouble\).*?\);', ufc_h, re.DOTALL))
+def _extract_decl(pattern):
+    """Return the declarations in ufc.h matching a regular expression."""
+    return '\n'.join(re.findall(pattern, ufc_h, re.DOTALL))
 
-UFC_INTEGRAL_DECL += '\n'.join(re.findall('typedef struct ufc_integral.*?ufc_integral;',
-                                          ufc_h, re.DOTALL))
-UFC_EXPRESSION_DECL = '\n'.join(re.findall('typedef struct ufc_expression.*?ufc_expression;', ufc_h, re.DOTALL))
+
+def _struct_decl(name):
+    """Return the typedef of the UFC struct with the given name."""
+    return _extract_decl(f'typedef struct {name}.*?{name};')
+
+
+UFC_ELEMENT_DECL = _struct_decl("ufc_finite_element")
+UFC_DOFMAP_DECL = _struct_decl("ufc_dofmap")
+UFC_FORM_DECL = _struct_decl("ufc_form")
+
+UFC_INTEGRAL_DECL = '\n'.join(
+    [_extract_decl(rf'typedef void ?\(ufc_tabulate_tensor_{scalar}\).*?\);')
+     for scalar in ("float32", "float64", "complex64", "complex128", "longdouble")]
+    + [_struct_decl("ufc_integral")])
+UFC_EXPRESSION_DECL = _struct_decl("ufc_expression")
+
+# Declarations of the compiled objects exported by a JIT module
+UFC_ELEMENT_EXTERN = "extern ufc_finite_element {name};\n"
+UFC_DOFMAP_EXTERN = "extern ufc_dofmap {name};\n"
+UFC_FORM_EXTERN = "extern ufc_form {name};\n"
+UFC_EXPRESSION_EXTERN = "extern ufc_expression {name};\n"
 
 
 def _compute_parameter_signature(parameters):
@@ -115,11 +128,9 @@ def compile_elements(elements, parameters=None, cache_dir=None, timeout=10, cffi
 
     try:
         decl = UFC_HEADER_DECL.format(p["scalar_type"]) + UFC_ELEMENT_DECL + UFC_DOFMAP_DECL
-        element_template = "extern ufc_finite_element {name};\n"
-        dofmap_template = "extern ufc_dofmap {name};\n"
         for i in range(len(elements)):
-            decl += element_template.format(name=names[i * 2])
-            decl += dofmap_template.format(name=names[i * 2 + 1])
+            decl += UFC_ELEMENT_EXTERN.format(name=names[i * 2])
+            decl += UFC_DOFMAP_EXTERN.format(name=names[i * 2 + 1])
 
         impl = _compile_objects(decl, elements, names, module_name, p, cache_dir,
                                 cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
@@ -158,10 +169,8 @@ def compile_forms(forms, parameters=None, cache_dir=None, timeout=10, cffi_extra
     try:
         decl = UFC_HEADER_DECL.format(p["scalar_type"]) + UFC_ELEMENT_DECL + UFC_DOFMAP_DECL + \
             UFC_INTEGRAL_DECL + UFC_FORM_DECL
-
-        form_template = "extern ufc_form {name};\n"
         for name in form_names:
-            decl += form_template.format(name=name)
+            decl += UFC_FORM_EXTERN.format(name=name)
 
         impl = _compile_objects(decl, forms, form_names, module_name, p, cache_dir,
                                 cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
@@ -203,10 +212,8 @@ def compile_expressions(expressions, parameters=None, cache_dir=None, timeout=10
     try:
         decl = UFC_HEADER_DECL.format(p["scalar_type"]) + UFC_ELEMENT_DECL + UFC_DOFMAP_DECL + \
             UFC_INTEGRAL_DECL + UFC_FORM_DECL + UFC_EXPRESSION_DECL
-
-        expression_template = "extern ufc_expression {name};\n"
         for name in expr_names:
-            decl += expression_template.format(name=name)
+            decl += UFC_EXPRESSION_EXTERN.format(name=name)
 
         impl = _compile_objects(decl, expressions, expr_names, module_name, p, cache_dir,
                                 cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
@@ -257,9 +264,8 @@ def _compile_objects(decl, ufl_objects, object_names, module_name, parameters, c
     # Create a "status ready" file. If this fails, it is an error,
     # because it should not exist yet.
     # Copy the stdout verbose output of the build into the ready file
-    fd = open(ready_name, "x")
-    fd.write(s)
-    fd.close()
+    with open(ready_name, "x") as fd:
+        fd.write(s)
 
     return code_body
 
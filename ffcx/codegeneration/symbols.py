@@ -70,6 +70,17 @@ class FFCXBackendSymbols(object):
 
         self.original_constant_offsets = original_constant_offsets
 
+        # Entity index of cells, and of facets indexed by whether the
+        # restriction is "-", see entity()
+        self._cell_entity = self.L.LiteralInt(0)
+        self._facet_entities = (self.S("entity_local_index[0]"), self.S("entity_local_index[1]"))
+
+        # Loop indices of the arguments, see argument_loop_index()
+        self._argument_loop_indices = tuple(self.S(index) for index in ("i", "j", "k", "l"))
+
+        # Cache of element table accesses, see element_table()
+        self._element_tables = {}
+
     def element_tensor(self):
         """Symbol for the element tensor itself."""
         return self.S("A")
@@ -78,21 +89,17 @@ class FFCXBackendSymbols(object):
         """Entity index for lookup in element tables."""
         if entitytype == "cell":
             # Always 0 for cells (even with restriction)
-            return self.L.LiteralInt(0)
+            return self._cell_entity
         elif entitytype == "facet":
-            postfix = "[0]"
-            if restriction == "-":
-                postfix = "[1]"
-            return self.S("entity_local_index" + postfix)
+            return self._facet_entities[restriction == "-"]
         elif entitytype == "vertex":
-            return self.S("entity_local_index[0]")
+            return self._facet_entities[0]
         else:
             logging.exception(f"Unknown entitytype {entitytype}")
 
     def argument_loop_index(self, iarg):
         """Loop index for argument #iarg."""
-        indices = ["i", "j", "k", "l"]
-        return self.S(indices[iarg])
+        return self._argument_loop_indices[iarg]
 
     def coefficient_dof_sum_index(self):
         """Index for loops over coefficient dofs, assumed to never be used in two nested loops."""
@@ -163,7 +170,7 @@ class FFCXBackendSymbols(object):
     def coefficient_value(self, mt):
         """Symbol for variable holding value or derivative component of coefficient."""
         c = self.coefficient_numbering[mt.terminal]
-        return self.S(format_mt_name("w%d" % (c, ), mt))
+        return self.S(format_mt_name(f"w{c}", mt))
 
     def constant_index_access(self, constant, index):
         offset = self.original_constant_offsets[constant]
@@ -175,8 +182,15 @@ class FFCXBackendSymbols(object):
         return self.S(name)
 
     def element_table(self, tabledata, entitytype, restriction):
-        entity = self.entity(entitytype, restriction)
-
+        key = (tabledata.name, tabledata.is_uniform, tabledata.is_piecewise, tabledata.is_permuted,
+               entitytype, restriction)
+        access = self._element_tables.get(key)
+        if access is None:
+            access = self._element_table(tabledata, entitytype, restriction)
+            self._element_tables[key] = access
+        return access
+
+    def _element_table(self, tabledata, entitytype, restriction):
         if tabledata.is_uniform:
             entity = 0
         else:
@@ -0,0 +1,75 @@
+# Copyright (C) 2021 FFCx contributors
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Rendering of the code generation templates.
+
+The templates are plain ``str.format`` strings with ``{name}`` fields.
+Each template is split into its literal fragments and field names
+once and compiled into a small rendering function, so that rendering
+it is a single join instead of re-parsing the template text for every
+generated object.
+"""
+
+import functools
+import sys
+from string import Formatter
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def split_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a template into its literal fragments and field names.
+
+    Returns a tuple (literals, fields) with len(literals) == len(fields) + 1,
+    such that the rendered string is literals[0] + value(fields[0]) +
+    literals[1] + ... + literals[-1].
+
+    As with str.format, doubled braces '{{' and '}}' are literal braces.
+    Raises ValueError for unmatched single braces, and for fields with a
+    format specification or conversion, which rendering does not support.
+    """
+    literals = [""]
+    fields = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format specification in template field '{field}'.")
+        literals[-1] += literal
+        if field is not None:
+            fields.append(field)
+            literals.append("")
+    # Fragments and field names recur within and across templates, so
+    # share a single string object for each
+    return tuple(map(sys.intern, literals)), tuple(map(sys.intern, fields))
+
+
+@functools.lru_cache(maxsize=None)
+def template_fields(template: str) -> FrozenSet[str]:
+    """Return the set of field names used in a template."""
+    return frozenset(split_template(template)[1])
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(template: str) -> Callable[[Mapping], str]:
+    """Compile a template into a dedicated rendering function.
+
+    The generated function joins the literal fragments and the looked up
+    field values in a single expression, so rendering involves no
+    iteration over the template structure.
+    """
+    literals, fields = split_template(template)
+    items = [repr(literals[0])]
+    for field, literal in zip(fields, literals[1:]):
+        items.append(f"str(d[{field!r}])")
+        if literal:
+            items.append(repr(literal))
+    source = f"def render(d):\n    return ''.join(({', '.join(items)},))\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<ffcx template>", "exec"), namespace)
+    return namespace["render"]
+
+
+def render(template: str, mapping: Mapping) -> str:
+    """Render a template, equivalent to template.format_map(mapping)."""
+    return compile_template(template)(mapping)
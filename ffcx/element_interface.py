@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import functools
 import warnings
 
 import basix
@@ -11,8 +12,13 @@ import numpy
 import ufl
 
 
+@functools.lru_cache()
 def create_element(ufl_element):
-    """Create an element from a UFL element."""
+    """Create an element from a UFL element.
+
+    Elements are cached, so repeated calls with an equal UFL element
+    return the same object.
+    """
     # TODO: EnrichedElement
     # TODO: Short/alternative names for elements
     # TODO: Allow different args for different parts of mixed element
@@ -57,6 +57,29 @@ c_extern_post = """
 #endif
 """
 
+# Top level comment, which depends only on the versions
+_ufc_comment = FORMAT_TEMPLATE["ufc comment"].format(ffcx_version=FFCX_VERSION, ufc_version=UFC_VERSION) + "//"
+
+_default_h_includes = [
+    "#include <ufc.h>",
+]
+
+_default_c_includes = [
+    "#include <math.h>",  # This should really be set by the backend
+    "#include <stdalign.h>",  # This should really be set by the backend
+    "#include <stdlib.h>",  # This should really be set by the backend
+    "#include <string.h>",  # This should really be set by the backend
+    "#include <ufc.h>"
+]
+
+# Formatted include blocks for the header and the source file, for real
+# and complex scalar types
+_includes_h = "\n".join(sorted(set(_default_h_includes))) + "\n"
+_includes_c = {
+    False: "\n".join(sorted(set(_default_c_includes))) + "\n",
+    True: "\n".join(sorted(set(_default_c_includes + ["#include <complex.h>"]))) + "\n",
+}
+
 
 def format_code(code, parameters):
     """Format given code in UFC format. Returns two strings with header and source file contents."""
@@ -65,34 +88,23 @@ def format_code(code, parameters):
     logger.info(79 * "*")
 
     # Generate code for comment at top of file
-    code_h_pre = _generate_comment(parameters) + "\n"
-    code_c_pre = _generate_comment(parameters) + "\n"
-
-    # Generate code for header
-    code_h_pre += FORMAT_TEMPLATE["header_h"]
-    code_c_pre += FORMAT_TEMPLATE["header_c"]
+    comment = _generate_comment(parameters)
 
     # Generate includes and add to preamble
     includes_h, includes_c = _generate_includes(parameters)
-    code_h_pre += includes_h
-    code_c_pre += includes_c
-
-    # Enclose header with 'extern "C"'
-    code_h_pre += c_extern_pre
-    code_h_post = c_extern_post
 
-    code_h = ""
-    code_c = ""
+    # Collect the pieces of each file and join them once, enclosing the
+    # header with 'extern "C"'
+    code_h = [comment, "\n", FORMAT_TEMPLATE["header_h"], includes_h, c_extern_pre]
+    code_c = [comment, "\n", FORMAT_TEMPLATE["header_c"], includes_c]
 
     for parts_code in code:
-        code_h += "".join([c[0] for c in parts_code])
-        code_c += "".join([c[1] for c in parts_code])
+        code_h.extend([c[0] for c in parts_code])
+        code_c.extend([c[1] for c in parts_code])
 
-    # Add headers to body
-    code_h = code_h_pre + code_h + code_h_post
-    code_c = code_c_pre + code_c
+    code_h.append(c_extern_post)
 
-    return code_h, code_c
+    return "".join(code_h), "".join(code_c)
 
 
 def write_code(code_h, code_c, prefix, output_dir):
@@ -101,48 +113,36 @@ def write_code(code_h, code_c, prefix, output_dir):
 
 
 def _write_file(output, prefix, postfix, output_dir):
-    """Write generated code to file."""
+    """Write generated code to file.
+
+    An existing file with identical contents is left untouched, so that
+    its timestamp does not trigger rebuilds of dependent code.
+    """
     filename = os.path.join(output_dir, prefix + postfix)
-    with open(filename, "w") as hfile:
+    # Work with the encoded bytes, so the code is compared and written
+    # without text mode decoding and newline translation
+    output = output.encode("utf-8")
+    try:
+        with open(filename, "rb") as hfile:
+            if hfile.read() == output:
+                logger.info(f"Generated code unchanged, not rewriting {filename}")
+                return
+    except OSError:
+        pass
+    with open(filename, "wb") as hfile:
         hfile.write(output)
 
 
 def _generate_comment(parameters):
     """Generate code for comment on top of file."""
-    # Generate top level comment
-    comment = FORMAT_TEMPLATE["ufc comment"].format(ffcx_version=FFCX_VERSION, ufc_version=UFC_VERSION)
-
-    # Add parameter information
-    comment += "//\n"
-    comment += "// This code was generated with the following parameters:\n"
-    comment += "//\n"
-    comment += textwrap.indent(pprint.pformat(parameters), "//  ")
-    comment += "\n"
-
-    return comment
+    return "\n".join([
+        _ufc_comment,
+        # Parameter information
+        "// This code was generated with the following parameters:",
+        "//",
+        textwrap.indent(pprint.pformat(parameters), "//  "),
+        ""])
 
 
 def _generate_includes(parameters):
-
-    default_h_includes = [
-        "#include <ufc.h>",
-    ]
-
-    default_c_includes = [
-        "#include <math.h>",  # This should really be set by the backend
-        "#include <stdalign.h>",  # This should really be set by the backend
-        "#include <stdlib.h>",  # This should really be set by the backend
-        "#include <string.h>",  # This should really be set by the backend
-        "#include <ufc.h>"
-    ]
-
-    if "_Complex" in parameters["scalar_type"]:
-        default_c_includes += ["#include <complex.h>"]
-
-    s_h = set(default_h_includes)
-    s_c = set(default_c_includes)
-
-    includes_h = "\n".join(sorted(s_h)) + "\n" if s_h else ""
-    includes_c = "\n".join(sorted(s_c)) + "\n" if s_c else ""
-
-    return includes_h, includes_c
+    return _includes_h, _includes_c["_Complex" in parameters["scalar_type"]]
@@ -128,10 +128,10 @@ def handle_product(v, fac, sf, F):
     else:  # arg * arg
         # Record products of each factor of arg-dependent operand
         factors = {}
+        terms1 = [(k1, F.nodes[fac1[k1]]['expression']) for k1 in sorted(fac1)]
         for k0 in sorted(fac0):
             f0 = F.nodes[fac0[k0]]['expression']
-            for k1 in sorted(fac1):
-                f1 = F.nodes[fac1[k1]]['expression']
+            for k1, f1 in terms1:
                 argkey = tuple(sorted(k0 + k1))  # sort key for canonical representation
                 factors[argkey] = graph_insert(F, f0 * f1)
 
@@ -243,6 +243,8 @@ def compute_argument_factorization(S, rank):
     # Extract argument component subgraph
     arg_indices = build_argument_indices(S)
     AV = [S.nodes[i]['expression'] for i in arg_indices]
+    # Position of each argument vertex in AV
+    arg_positions = {si: ai for ai, si in enumerate(arg_indices)}
 
     # Data structure for building non-argument factors
     F = ExpressionGraph()
@@ -272,7 +274,7 @@ def compute_argument_factorization(S, rank):
         deps = S.out_edges[si]
         v = attr['expression']
 
-        if si in arg_indices:
+        if si in arg_positions:
             assert len(deps) == 0
             # v is a modified Argument
             factors = {(si, ): one_index}
@@ -318,21 +320,15 @@ def compute_argument_factorization(S, rank):
             # Map argkeys from indices into SV to indices into AV,
             # and resort keys for canonical representation
             for argkey, fi in S.nodes[S_target]['factors'].items():
-                ai_fi = {tuple(sorted(arg_indices.index(si) for si in argkey)): fi}
+                ai_fi = {tuple(sorted(arg_positions[si] for si in argkey)): fi}
                 for comp in S.nodes[S_target]["component"]:
-                    if factors.get(comp):
-                        factors[comp].update(ai_fi)
-                    else:
-                        factors[comp] = ai_fi
+                    factors.setdefault(comp, {}).update(ai_fi)
 
     # Indices into F that are needed for final result
     for comp, target in factors.items():
         for argkey, fi in target.items():
-            F.nodes[fi]["target"] = F.nodes[fi].get("target", [])
-            F.nodes[fi]["target"].append(argkey)
-
-            F.nodes[fi]["component"] = F.nodes[fi].get("component", [])
-            F.nodes[fi]["component"].append(comp)
+            F.nodes[fi].setdefault("target", []).append(argkey)
+            F.nodes[fi].setdefault("component", []).append(comp)
 
     # Compute dependencies in FV
     for i, v in F.nodes.items():
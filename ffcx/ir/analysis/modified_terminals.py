@@ -40,6 +40,10 @@ class ModifiedTerminal(object):
         - flat_component
     """
 
+    __slots__ = ("expr", "terminal", "reference_value", "base_shape", "base_symmetry", "component",
+                 "flat_component", "global_derivatives", "local_derivatives", "averaged", "restriction",
+                 "_hash")
+
     def __init__(self, expr, terminal, reference_value, base_shape, base_symmetry, component,
                  flat_component, global_derivatives, local_derivatives, averaged, restriction):
         # The original expression
@@ -71,6 +75,9 @@ class ModifiedTerminal(object):
         # Restriction to one cell or the other for interior facet integrals
         self.restriction = restriction
 
+        # Hash of as_tuple(), computed on first use
+        self._hash = None
+
     def as_tuple(self):
         """Return a tuple with hashable values that uniquely identifies this modified terminal.
 
@@ -112,7 +119,9 @@ class ModifiedTerminal(object):
         return (n, p, rv, fc, gd, ld, a, r)
 
     def __hash__(self):
-        return hash(self.as_tuple())
+        if self._hash is None:
+            self._hash = hash(self.as_tuple())
+        return self._hash
 
     def __eq__(self, other):
         return isinstance(other, ModifiedTerminal) and self.as_tuple() == other.as_tuple()
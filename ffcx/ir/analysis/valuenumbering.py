@@ -55,8 +55,7 @@ class ValueNumberer(object):
         return begin
 
     def get_node_symbols(self, expr):
-        idx = [i for i, v in self.G.nodes.items() if v['expression'] == expr][0]
-        return self.V_symbols[idx]
+        return self.V_symbols[self.G.e2i[expr]]
 
     def compute_symbols(self):
         for i, v in self.G.nodes.items():
@@ -67,10 +66,13 @@ class ValueNumberer(object):
             if f:
                 symbol = f(expr)
             else:
-                # Look for parent class types instead
+                # Look for parent class types instead, and remember the
+                # result for this type
                 for k in self.call_lookup.keys():
                     if isinstance(expr, k):
-                        symbol = self.call_lookup[k](expr)
+                        f = self.call_lookup[k]
+                        self.call_lookup[type(expr)] = f
+                        symbol = f(expr)
                         break
 
             if symbol is None:
@@ -156,6 +158,10 @@ class ValueNumberer(object):
         else:
             d_components = [()]
 
+        # Derivative components with symmetries of mixed derivatives
+        # mapped out, shared by all base components
+        mapped_d_components = [tuple(sorted(dc)) for dc in d_components]
+
         # Get base shape without the derivative axes
         base_components = ufl.permutation.compute_indices(mt.base_shape)
 
@@ -163,11 +169,10 @@ class ValueNumberer(object):
         symbols = []
         mapped_symbols = {}
         for bc in base_components:
-            for dc in d_components:
-                # Build mapped component mc with symmetries from element
-                # and derivatives combined
-                mbc = mt.base_symmetry.get(bc, bc)
-                mdc = tuple(sorted(dc))
+            # Build mapped component with symmetries from element
+            mbc = mt.base_symmetry.get(bc, bc)
+            for mdc in mapped_d_components:
+                # Combine with mapped derivative component
                 mc = mbc + mdc
 
                 # Get existing symbol or create new and store with
@@ -5,11 +5,14 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Utility to draw graphs."""
 
+import logging
 
 from ffcx.ir.analysis.modified_terminals import strip_modified_terminal
 from ufl.classes import (Argument, Division, FloatValue, Indexed, IntValue,
                          Product, ReferenceValue, Sum)
 
+logger = logging.getLogger("ffcx")
+
 
 def visualise_graph(Gx, filename):
 
@@ -19,7 +22,7 @@ def visualise_graph(Gx, filename):
         raise RuntimeError("Install pygraphviz")
 
     if Gx.number_of_nodes() > 400:
-        print("Skipping visualisation")
+        logger.warning("Skipping visualisation of graph with more than 400 nodes")
         return
 
     G = pgv.AGraph(strict=False, directed=True)
@@ -47,8 +47,17 @@ def clamp_table_small_numbers(table,
     """Clamp almost 0,1,-1 values to integers. Returns new table."""
     # Get shape of table and number of columns, defined as the last axis
     table = numpy.asarray(table)
-    for n in numbers:
-        table[numpy.where(numpy.isclose(table, n, rtol=rtol, atol=atol))] = n
+    if all(float(n).is_integer() for n in numbers) and atol + rtol * max(map(abs, numbers), default=0) < 0.5:
+        # With integer numbers and tolerances below 1/2, a value can only
+        # be close to the integer nearest to it. Compare against that in
+        # a single pass instead of one pass per number.
+        nearest = numpy.rint(table)
+        mask = numpy.isclose(table, nearest, rtol=rtol, atol=atol)
+        mask &= numpy.isin(nearest, numbers)
+        table[mask] = nearest[mask]
+    else:
+        for n in numbers:
+            table[numpy.isclose(table, n, rtol=rtol, atol=atol)] = n
     return table
 
 
@@ -158,11 +167,11 @@ def generate_psi_table_name(quadrature_rule, element_counter, averaged, entityty
     Q   - unique ID of quadrature rule, to distinguish between tables in a mixed quadrature rule setting
 
     """
-    name = "FE%d" % element_counter
+    name = f"FE{element_counter}"
     if flat_component is not None:
-        name += "_C%d" % flat_component
+        name += f"_C{flat_component}"
     if any(derivative_counts):
-        name += "_D" + "".join(str(d) for d in derivative_counts)
+        name += "_D" + "".join([str(d) for d in derivative_counts])
     name += {None: "", "cell": "_AC", "facet": "_AF"}[averaged]
     name += {"cell": "", "facet": "_F", "vertex": "_V"}[entitytype]
     name += f"_Q{quadrature_rule.id()}"
@@ -221,49 +230,105 @@ def get_modified_terminal_element(mt):
 
 def permute_quadrature_interval(points, reflections=0):
     output = points.copy()
-    for p in output:
-        assert len(p) < 2 or numpy.isclose(p[1], 0)
-        assert len(p) < 3 or numpy.isclose(p[2], 0)
+    assert output.shape[1] < 2 or numpy.allclose(output[:, 1], 0)
+    assert output.shape[1] < 3 or numpy.allclose(output[:, 2], 0)
     for i in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [1 - p[0]]
+        output[:, 0] = 1 - output[:, 0]
     return output
 
 
 def permute_quadrature_triangle(points, reflections=0, rotations=0):
     output = points.copy()
-    for p in output:
-        assert len(p) < 3 or numpy.isclose(p[2], 0)
+    assert output.shape[1] < 3 or numpy.allclose(output[:, 2], 0)
     for i in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0] - p[1]]
+        x, y = output[:, 0].copy(), output[:, 1].copy()
+        output[:, 0] = y
+        output[:, 1] = 1 - x - y
     for i in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output[:, [0, 1]] = output[:, [1, 0]]
     return output
 
 
 def permute_quadrature_quadrilateral(points, reflections=0, rotations=0):
     output = points.copy()
-    for p in output:
-        assert len(p) < 3 or numpy.isclose(p[2], 0)
+    assert output.shape[1] < 3 or numpy.allclose(output[:, 2], 0)
     for i in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0]]
+        x, y = output[:, 0].copy(), output[:, 1].copy()
+        output[:, 0] = y
+        output[:, 1] = 1 - x
     for i in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output[:, [0, 1]] = output[:, [1, 0]]
     return output
 
 
+def tabulate_element_table(quadrature_rule, cell, integral_type, entitytype, element, avg,
+                           local_derivatives, flat_component, rtol=default_rtol, atol=default_atol):
+    """Tabulate the element table for a modified terminal, including all quadrature permutations.
+
+    Tables only depend on their arguments, so build_optimized_tables
+    shares results between integrals through its table_cache.
+
+    Returns a tuple (table, offset, stride), with table a read-only
+    array with axes (permutation, entity, point, dof).
+    """
+    tdim = cell.topological_dimension()
+
+    if integral_type == "interior_facet":
+        if tdim == 1:
+            t = get_ffcx_table_values(quadrature_rule.points, cell,
+                                      integral_type, element, avg, entitytype,
+                                      local_derivatives, flat_component)
+        elif tdim == 2:
+            new_table = []
+            for ref in range(2):
+                new_table.append(get_ffcx_table_values(
+                    permute_quadrature_interval(quadrature_rule.points, ref), cell,
+                    integral_type, element, avg, entitytype, local_derivatives, flat_component))
+
+            t = new_table[0]
+            t['array'] = numpy.vstack([td['array'] for td in new_table])
+        elif tdim == 3:
+            cell_type = cell.cellname()
+            if cell_type == "tetrahedron":
+                new_table = []
+                for rot in range(3):
+                    for ref in range(2):
+                        new_table.append(get_ffcx_table_values(
+                            permute_quadrature_triangle(
+                                quadrature_rule.points, ref, rot),
+                            cell, integral_type, element, avg, entitytype, local_derivatives,
+                            flat_component))
+                t = new_table[0]
+                t['array'] = numpy.vstack([td['array'] for td in new_table])
+            elif cell_type == "hexahedron":
+                new_table = []
+                for rot in range(4):
+                    for ref in range(2):
+                        new_table.append(get_ffcx_table_values(
+                            permute_quadrature_quadrilateral(
+                                quadrature_rule.points, ref, rot),
+                            cell, integral_type, element, avg, entitytype, local_derivatives, flat_component))
+                t = new_table[0]
+                t['array'] = numpy.vstack([td['array'] for td in new_table])
+    else:
+        t = get_ffcx_table_values(quadrature_rule.points, cell,
+                                  integral_type, element, avg, entitytype,
+                                  local_derivatives, flat_component)
+    # Clean up table, and protect the cached array from modification
+    tbl = clamp_table_small_numbers(t['array'], rtol=rtol, atol=atol)
+    tbl.setflags(write=False)
+    return tbl, t['offset'], t['stride']
+
+
 def build_optimized_tables(quadrature_rule, cell, integral_type, entitytype,
                            modified_terminals, existing_tables,
-                           rtol=default_rtol, atol=default_atol):
+                           rtol=default_rtol, atol=default_atol, table_cache=None):
     """Build the element tables needed for a list of modified terminals.
 
     Input:
       entitytype - str
       modified_terminals - ordered sequence of unique modified terminals
+      table_cache - dict of tabulated tables, shared between calls
       FIXME: Document
 
     Output:
@@ -286,6 +351,9 @@ def build_optimized_tables(quadrature_rule, cell, integral_type, entitytype,
     mt_tables = {}
 
     _existing_tables = existing_tables.copy()
+    if table_cache is None:
+        table_cache = {}
+    mt_table_cache = {}
 
     for mt in modified_terminals:
         res = analysis.get(mt)
@@ -293,97 +361,58 @@ def build_optimized_tables(quadrature_rule, cell, integral_type, entitytype,
             continue
         element, avg, local_derivatives, flat_component = res
 
-        # Generate table and store table name with modified terminal
-
-        # Build name for this particular table
-        element_number = element_numbers[element]
-        name = generate_psi_table_name(quadrature_rule, element_number, avg, entitytype,
-                                       local_derivatives, flat_component)
-
-        # FIXME - currently just recalculate the tables every time,
-        # only reusing them if they match numerically.
-        # It should be possible to reuse the cached tables by name, but
-        # the dofmap offset may differ due to restriction.
-
-        tdim = cell.topological_dimension()
-
-        if integral_type == "interior_facet":
-            if tdim == 1:
-                t = get_ffcx_table_values(quadrature_rule.points, cell,
-                                          integral_type, element, avg, entitytype,
-                                          local_derivatives, flat_component)
-            elif tdim == 2:
-                new_table = []
-                for ref in range(2):
-                    new_table.append(get_ffcx_table_values(
-                        permute_quadrature_interval(quadrature_rule.points, ref), cell,
-                        integral_type, element, avg, entitytype, local_derivatives, flat_component))
-
-                t = new_table[0]
-                t['array'] = numpy.vstack([td['array'] for td in new_table])
-            elif tdim == 3:
-                cell_type = cell.cellname()
-                if cell_type == "tetrahedron":
-                    new_table = []
-                    for rot in range(3):
-                        for ref in range(2):
-                            new_table.append(get_ffcx_table_values(
-                                permute_quadrature_triangle(
-                                    quadrature_rule.points, ref, rot),
-                                cell, integral_type, element, avg, entitytype, local_derivatives,
-                                flat_component))
-                    t = new_table[0]
-                    t['array'] = numpy.vstack([td['array'] for td in new_table])
-                elif cell_type == "hexahedron":
-                    new_table = []
-                    for rot in range(4):
-                        for ref in range(2):
-                            new_table.append(get_ffcx_table_values(
-                                permute_quadrature_quadrilateral(
-                                    quadrature_rule.points, ref, rot),
-                                cell, integral_type, element, avg, entitytype, local_derivatives, flat_component))
-                    t = new_table[0]
-                    t['array'] = numpy.vstack([td['array'] for td in new_table])
-        else:
-            t = get_ffcx_table_values(quadrature_rule.points, cell,
-                                      integral_type, element, avg, entitytype,
-                                      local_derivatives, flat_component)
-        # Clean up table
-        tbl = clamp_table_small_numbers(t['array'], rtol=rtol, atol=atol)
-        tabletype = analyse_table_type(tbl)
-
-        if tabletype in piecewise_ttypes:
-            # Reduce table to dimension 1 along num_points axis in generated code
-            tbl = tbl[:, :, :1, :]
-        if tabletype in uniform_ttypes:
-            # Reduce table to dimension 1 along num_entities axis in generated code
-            tbl = tbl[:, :1, :, :]
-        is_permuted = is_permuted_table(tbl)
-        if not is_permuted:
-            # Reduce table along num_perms axis
-            tbl = tbl[:1, :, :, :]
-
-        # Check for existing identical table
-        new_table = True
-        for table_name in _existing_tables:
-            if equal_tables(tbl, _existing_tables[table_name]):
-                name = table_name
-                tbl = _existing_tables[name]
-                new_table = False
-                break
-
-        if new_table:
-            _existing_tables[name] = tbl
+        # The table only depends on the restriction through the dofmap
+        # offset, so compute each distinct table once
+        key = (element, avg, tuple(local_derivatives), flat_component)
+        cached = mt_table_cache.get(key)
+        if cached is None:
+            # Generate table and store table name with modified terminal
+
+            # Build name for this particular table
+            element_number = element_numbers[element]
+            name = generate_psi_table_name(quadrature_rule, element_number, avg, entitytype,
+                                           local_derivatives, flat_component)
+
+            tabulate_key = (quadrature_rule, cell, integral_type, entitytype, element, avg,
+                            tuple(local_derivatives), flat_component, rtol, atol)
+            if tabulate_key not in table_cache:
+                table_cache[tabulate_key] = tabulate_element_table(*tabulate_key)
+            tbl, table_offset, block_size = table_cache[tabulate_key]
+            tabletype = analyse_table_type(tbl)
+
+            if tabletype in piecewise_ttypes:
+                # Reduce table to dimension 1 along num_points axis in generated code
+                tbl = tbl[:, :, :1, :]
+            if tabletype in uniform_ttypes:
+                # Reduce table to dimension 1 along num_entities axis in generated code
+                tbl = tbl[:, :1, :, :]
+            is_permuted = is_permuted_table(tbl)
+            if not is_permuted:
+                # Reduce table along num_perms axis
+                tbl = tbl[:1, :, :, :]
+
+            # Check for existing identical table
+            new_table = True
+            for table_name in _existing_tables:
+                if equal_tables(tbl, _existing_tables[table_name]):
+                    name = table_name
+                    tbl = _existing_tables[name]
+                    new_table = False
+                    break
+
+            if new_table:
+                _existing_tables[name] = tbl
+
+            cached = (name, tbl, tabletype, is_permuted, table_offset, block_size)
+            mt_table_cache[key] = cached
+        name, tbl, tabletype, is_permuted, table_offset, block_size = cached
 
         cell_offset = 0
-        basix_element = create_element(element)
-
         if mt.restriction == "-" and isinstance(mt.terminal, ufl.classes.FormArgument):
             # offset = 0 or number of element dofs, if restricted to "-"
-            cell_offset = basix_element.dim
+            cell_offset = create_element(element).dim
 
-        offset = cell_offset + t['offset']
-        block_size = t['stride']
+        offset = cell_offset + table_offset
 
         # tables is just np.arrays, mt_tables hold metadata too
         mt_tables[mt] = unique_table_reference_t(
@@ -394,12 +423,11 @@ def build_optimized_tables(quadrature_rule, cell, integral_type, entitytype,
 
 
 def is_zeros_table(table, rtol=default_rtol, atol=default_atol):
-    return (numpy.product(table.shape) == 0
-            or numpy.allclose(table, numpy.zeros(table.shape), rtol=rtol, atol=atol))
+    return table.size == 0 or numpy.allclose(table, 0.0, rtol=rtol, atol=atol)
 
 
 def is_ones_table(table, rtol=default_rtol, atol=default_atol):
-    return numpy.allclose(table, numpy.ones(table.shape), rtol=rtol, atol=atol)
+    return numpy.allclose(table, 1.0, rtol=rtol, atol=atol)
 
 
 def is_quadrature_table(table, rtol=default_rtol, atol=default_atol):
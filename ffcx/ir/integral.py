@@ -6,7 +6,6 @@
 """Main algorithm for building the integral intermediate representation."""
 
 import collections
-import itertools
 import logging
 
 import ufl
@@ -41,7 +40,7 @@ block_data_t = collections.namedtuple("block_data_t",
 
 
 def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_shape,
-                        p, visualise):
+                        p, visualise, table_cache=None):
     # The intermediate representation dict we're building and returning
     # here
     ir = {}
@@ -88,7 +87,8 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
             initial_terminals.values(),
             ir["unique_tables"],
             rtol=p["table_rtol"],
-            atol=p["table_atol"])
+            atol=p["table_atol"],
+            table_cache=table_cache)
 
         # Fetch unique tables for this quadrature rule
         table_types = {v.name: v.ttype for v in mt_table_reference.values()}
@@ -138,19 +138,14 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
             # components
             assert len(F.nodes[fi]['target']) == len(F.nodes[fi]['component'])
 
-            k = 0
-            for w in F.nodes[fi]['target']:
-                comp = F.nodes[fi]['component'][k]
-                argument_factorization[w] = argument_factorization.get(w, [])
-
+            for w, comp in zip(F.nodes[fi]['target'], F.nodes[fi]['component']):
                 # Store tuple of (factor index, component index)
-                argument_factorization[w].append((fi, comp))
-                k += 1
+                argument_factorization.setdefault(w, []).append((fi, comp))
 
         # Get list of indices in F which are the arguments (should be at start)
         argkeys = set()
         for w in argument_factorization:
-            argkeys = argkeys | set(w)
+            argkeys.update(w)
         argkeys = list(argkeys)
 
         # Build set of modified_terminals for each mt factorized vertex in F
@@ -206,10 +201,7 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
             # Check if each *each* factor corresponding to this argument is piecewise
             all_factors_piecewise = all(F.nodes[ifi[0]]["status"] == 'piecewise' for ifi in fi_ci)
-            block_is_permuted = False
-            for name in unames:
-                if tables[name].shape[0] > 1:
-                    block_is_permuted = True
+            block_is_permuted = any(tables[name].shape[0] > 1 for name in unames)
             ma_data = []
             for i, ma in enumerate(ma_indices):
                 ma_data.append(ma_data_t(ma, trs[i]))
@@ -227,14 +219,14 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
         # Figure out which table names are referenced
         active_table_names = set()
-        for i, v in F.nodes.items():
-            tr = v.get('tr')
-            if tr is not None and F.nodes[i]['status'] != 'inactive':
-                active_table_names.add(tr.name)
+        for partition in F.partitions.values():
+            for i in partition:
+                tr = F.nodes[i].get('tr')
+                if tr is not None:
+                    active_table_names.add(tr.name)
 
         # Figure out which table names are referenced in blocks
-        for blockmap, contributions in itertools.chain(
-                block_contributions.items()):
+        for contributions in block_contributions.values():
             for blockdata in contributions:
                 for mad in blockdata.ma_data:
                     active_table_names.add(mad.tabledata.name)
@@ -271,22 +263,16 @@ def analyse_dependencies(F, mt_unique_table_reference):
     # Varying nodes are identified by their tables ('tr'). All their parent
     # nodes are also set to 'varying' - any remaining active nodes are 'piecewise'.
 
-    # Set targets, and dependencies to 'active'
-    targets = [i for i, v in F.nodes.items() if v.get('target')]
-    for i, v in F.nodes.items():
-        v['status'] = 'inactive'
-
-    while targets:
-        s = targets.pop()
-        F.nodes[s]['status'] = 'active'
-        for j in F.out_edges[s]:
-            if F.nodes[j]['status'] == 'inactive':
-                targets.append(j)
-
-    # Build piecewise/varying markers for factorized_vertices
+    # In a single pass over the nodes: reset all statuses, collect the
+    # targets, and build the varying markers for factorized vertices
     varying_ttypes = ("varying", "quadrature", "uniform")
+    targets = []
     varying_indices = []
     for i, v in F.nodes.items():
+        v['status'] = 'inactive'
+        if v.get('target'):
+            targets.append(i)
+
         if v.get('mt') is None:
             continue
         tr = v.get('tr')
@@ -305,6 +291,14 @@ def analyse_dependencies(F, mt_unique_table_reference):
             # not sure which cases this will cover (if any)
             # varying_indices.append(i)
 
+    # Set targets, and dependencies to 'active'
+    while targets:
+        s = targets.pop()
+        F.nodes[s]['status'] = 'active'
+        for j in F.out_edges[s]:
+            if F.nodes[j]['status'] == 'inactive':
+                targets.append(j)
+
     # Set all parents of active varying nodes to 'varying'
     while varying_indices:
         s = varying_indices.pop()
@@ -313,10 +307,15 @@ def analyse_dependencies(F, mt_unique_table_reference):
             for j in F.in_edges[s]:
                 varying_indices.append(j)
 
-    # Any remaining active nodes must be 'piecewise'
+    # Any remaining active nodes must be 'piecewise'. Attach the nodes
+    # of each active status, in order, so that code generation does not
+    # have to filter all nodes for each partition
+    F.partitions = {'piecewise': [], 'varying': []}
     for i, v in F.nodes.items():
         if v['status'] == 'active':
             v['status'] = 'piecewise'
+        if v['status'] != 'inactive':
+            F.partitions[v['status']].append(i)
 
 
 def replace_quadratureweight(expression):
@@ -17,6 +17,8 @@ logger = logging.getLogger("ffcx")
 
 
 class QuadratureRule:
+    __slots__ = ("points", "weights", "_hash", "hash_obj")
+
     def __init__(self, points, weights):
         self.points = numpy.ascontiguousarray(points)  # TODO: change basix to make this unnecessary
         self.weights = weights
@@ -9,6 +9,7 @@ Parse command-line arguments and generate code from input UFL form files.
 """
 
 import argparse
+import concurrent.futures
 import cProfile
 import logging
 import pathlib
@@ -30,6 +31,7 @@ parser.add_argument(
 parser.add_argument("-o", "--output-directory", type=str, default=".", help="output directory")
 parser.add_argument("--visualise", action="store_true", help="visualise the IR graph")
 parser.add_argument("-p", "--profile", action='store_true', help="enable profiling")
+parser.add_argument("-j", "--jobs", type=int, help="number of UFL files to compile in parallel (default=1)")
 
 # Add all parameters from FFCx parameter system
 for param_name, (param_val, param_desc) in FFCX_DEFAULT_PARAMETERS.items():
@@ -38,50 +40,74 @@ for param_name, (param_val, param_desc) in FFCX_DEFAULT_PARAMETERS.items():
 
 parser.add_argument("ufl_file", nargs='+', help="UFL file(s) to be compiled")
 
+# Arguments that are not passed on to the FFCx parameter system
+_cli_only_arguments = ("jobs", "ufl_file")
+
 
 def main(args=None):
     xargs = parser.parse_args(args)
+    if xargs.jobs is not None and xargs.jobs < 1:
+        parser.error("argument -j/--jobs: must be at least 1")
 
-    # Parse all other parameters
-    priority_parameters = {k: v for k, v in xargs.__dict__.items() if v is not None}
+    # Parse all other parameters, leaving out the command line only
+    # arguments, which do not affect the generated code
+    priority_parameters = {k: v for k, v in xargs.__dict__.items()
+                           if v is not None and k not in _cli_only_arguments}
     parameters = get_parameters(priority_parameters)
 
-    # Call parser and compiler for each file
     for filename in xargs.ufl_file:
-        file = pathlib.Path(filename)
-        if file.suffix != ".ufl":
+        if pathlib.Path(filename).suffix != ".ufl":
             logger.error("Expecting a UFL form file (.ufl).")
             return 1
 
-        # Remove weird characters (file system allows more than the C
-        # preprocessor)
-        prefix = file.stem
-        prefix = re.subn("[^{}]".format(string.ascii_letters + string.digits + "_"), "!", prefix)[0]
-        prefix = re.subn("!+", "_", prefix)[0]
-
-        # Turn on profiling
-        if xargs.profile:
-            pr = cProfile.Profile()
-            pr.enable()
-
-        # Load UFL file
-        ufd = ufl.algorithms.load_ufl_file(filename)
-
-        # Generate code
-        if len(ufd.forms) > 0:
-            code_h, code_c = compiler.compile_ufl_objects(
-                ufd.forms, ufd.object_names, prefix=prefix, parameters=parameters, visualise=xargs.visualise)
-        else:
-            code_h, code_c = compiler.compile_ufl_objects(
-                ufd.elements, ufd.object_names, prefix=prefix, parameters=parameters, visualise=xargs.visualise)
-
-        # Write to file
-        formatting.write_code(code_h, code_c, prefix, xargs.output_directory)
-
-        # Turn off profiling and write status to file
-        if xargs.profile:
-            pr.disable()
-            pfn = f"ffcx_{prefix}.profile"
-            pr.dump_stats(pfn)
+    # Call parser and compiler for each file. Files are independent, so
+    # they can be compiled in separate processes.
+    jobs = min(xargs.jobs or 1, len(xargs.ufl_file))
+    if jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_compile_file, filename, parameters, xargs.output_directory,
+                                       xargs.visualise, xargs.profile)
+                       for filename in xargs.ufl_file]
+            for future in futures:
+                future.result()
+    else:
+        for filename in xargs.ufl_file:
+            _compile_file(filename, parameters, xargs.output_directory, xargs.visualise, xargs.profile)
 
     return 0
+
+
+def _compile_file(filename, parameters, output_directory, visualise, profile):
+    """Generate code for the forms or elements in a UFL file and write it to the output directory."""
+    file = pathlib.Path(filename)
+
+    # Remove weird characters (file system allows more than the C
+    # preprocessor)
+    prefix = file.stem
+    prefix = re.subn("[^{}]".format(string.ascii_letters + string.digits + "_"), "!", prefix)[0]
+    prefix = re.subn("!+", "_", prefix)[0]
+
+    # Turn on profiling
+    if profile:
+        pr = cProfile.Profile()
+        pr.enable()
+
+    # Load UFL file
+    ufd = ufl.algorithms.load_ufl_file(filename)
+
+    # Generate code
+    if ufd.forms:
+        code_h, code_c = compiler.compile_ufl_objects(
+            ufd.forms, ufd.object_names, prefix=prefix, parameters=parameters, visualise=visualise)
+    else:
+        code_h, code_c = compiler.compile_ufl_objects(
+            ufd.elements, ufd.object_names, prefix=prefix, parameters=parameters, visualise=visualise)
+
+    # Write to file
+    formatting.write_code(code_h, code_c, prefix, output_directory)
+
+    # Turn off profiling and write status to file
+    if profile:
+        pr.disable()
+        pfn = f"ffcx_{prefix}.profile"
+        pr.dump_stats(pfn)
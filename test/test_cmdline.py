@@ -19,3 +19,28 @@ def test_visualise():
     subprocess.run(["ffcx", "--visualise", "Poisson.ufl"])
     assert os.path.isfile("S.pdf")
     assert os.path.isfile("F.pdf")
+
+
+def test_jobs(tmp_path):
+    poisson = os.path.join(os.path.dirname(__file__), "Poisson.ufl")
+    ufl_files = []
+    for name in ("Poisson1", "Poisson2"):
+        ufl_file = tmp_path / f"{name}.ufl"
+        with open(poisson) as f:
+            ufl_file.write_text(f.read())
+        ufl_files.append(str(ufl_file))
+    subprocess.run(["ffcx", "-j", "2", "-o", str(tmp_path)] + ufl_files, check=True)
+    for name in ("Poisson1", "Poisson2"):
+        assert (tmp_path / f"{name}.h").is_file()
+        assert (tmp_path / f"{name}.c").is_file()
+
+    # The command line only arguments do not end up in the parameters
+    # recorded in the generated code
+    assert "'jobs'" not in (tmp_path / "Poisson1.c").read_text()
+
+
+def test_jobs_invalid(tmp_path):
+    os.chdir(os.path.dirname(__file__))
+    result = subprocess.run(["ffcx", "-j", "0", "-o", str(tmp_path), "Poisson.ufl"])
+    assert result.returncode != 0
+    assert not (tmp_path / "Poisson.c").exists()
@@ -0,0 +1,99 @@
+# Copyright (C) 2021 FFCx contributors
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import numpy as np
+
+import ffcx.codegeneration.C.cnodes as L
+import ufl
+from ffcx.codegeneration.C.ufl_to_cnodes import UFL2CNodesTranslatorCpp
+
+
+def test_bool_array_decl():
+    decl = L.ArrayDecl("static bool", "enabled", 2, values=np.array([True, False]))
+    assert decl.cs_format() == "static bool enabled[2] = { true, false };"
+
+
+def test_array_decl_eq():
+    values = np.array([[1.0, 2.0], [3.0, 4.0]])
+    a = L.ArrayDecl("double", "A", (2, 2), values=values)
+    assert a == L.ArrayDecl("double", "A", (2, 2), values=values.copy())
+    assert a != L.ArrayDecl("double", "A", (2, 2), values=np.array([[1.0, 2.0], [3.0, 5.0]]))
+    assert a != L.ArrayDecl("double", "B", (2, 2), values=values)
+
+
+def test_switch_eq():
+    s = L.Switch("i", [(0, L.Return(1)), (1, L.Return(2))])
+    assert s == L.Switch("i", [(0, L.Return(1)), (1, L.Return(2))])
+    assert s != L.Switch("i", [(0, L.Return(1)), (1, L.Return(3))])
+    assert s != L.Switch("i", [(0, L.Return(1)), (2, L.Return(2))])
+
+
+def test_for_range_eq():
+    body = L.Assign(L.Symbol("A")[L.Symbol("i")], 0.0)
+    f = L.ForRange("i", 0, 3, body)
+    assert f == L.ForRange("i", 0, 3, body)
+    assert f != L.ForRange("i", 0, 4, body)
+    assert f != L.ForRange("i", 1, 3, body)
+
+
+def test_float_product_zero():
+    a, b = L.Symbol("a"), L.Symbol("b")
+    zero = L.LiteralFloat(0.0)
+    assert L.float_product([a, zero, b]) is zero
+
+
+def test_float_product_one():
+    a = L.Symbol("a")
+    assert L.float_product([]) == L.LiteralFloat(1.0)
+    assert L.float_product([L.LiteralFloat(1.0), L.LiteralInt(1)]) == L.LiteralFloat(1.0)
+    assert L.float_product([L.LiteralFloat(1.0), a]) == a
+    # Literals folding to one are dropped
+    assert L.float_product([L.LiteralFloat(2.0), a, L.LiteralFloat(0.5)]) == a
+    assert L.float_product([L.LiteralFloat(2.0), L.LiteralFloat(0.5)]) == L.LiteralFloat(1.0)
+
+
+def test_float_product_folding():
+    a, b = L.Symbol("a"), L.Symbol("b")
+    # Literals are folded into the position of the first literal
+    p = L.float_product([a, L.LiteralFloat(2.0), b, L.LiteralFloat(3.0)])
+    assert p == L.Product([a, L.LiteralFloat(6.0), b])
+    assert p.ce_format() == "a * 6.0 * b"
+    p = L.float_product([L.LiteralInt(2), a, L.LiteralInt(3)])
+    assert p == L.Product([L.LiteralInt(6), a])
+    assert isinstance(p.args[0], L.LiteralInt)
+
+
+def test_literal_int_folding():
+    assert L.LiteralInt(2) + 3 == L.LiteralInt(5)
+    assert 3 + L.LiteralInt(2) == L.LiteralInt(5)
+    assert L.LiteralInt(2) - 3 == L.LiteralInt(-1)
+    assert 3 - L.LiteralInt(2) == L.LiteralInt(1)
+
+
+def test_literal_int_symbol_not_folded():
+    i = L.Symbol("i")
+    assert L.LiteralInt(2) + i == L.Add(L.LiteralInt(2), i)
+    assert i + L.LiteralInt(2) == L.Add(i, L.LiteralInt(2))
+    assert 3 - i == L.Sub(L.LiteralInt(3), i)
+    assert (i + 2).ce_format() == "i + 2"
+    assert (3 - i).ce_format() == "3 - i"
+
+
+def test_power_expansion():
+    translator = UFL2CNodesTranslatorCpp(L, "double")
+    u = ufl.Coefficient(ufl.FiniteElement("Lagrange", ufl.triangle, 1))
+    w0 = L.Symbol("w0")
+
+    # Small integer powers of symbols are expanded into products
+    assert translator.power(u**2, w0, L.LiteralInt(2)).ce_format() == "w0 * w0"
+    assert translator.power(u**2, w0[1], L.LiteralInt(2)).ce_format() == "w0[1] * w0[1]"
+
+    # Larger powers are left to pow
+    assert translator.power(u**5, w0, L.LiteralInt(5)).ce_format() == "pow(w0, 5)"
+
+    # Compound operands are not copied into every factor
+    a = L.Add(w0, L.Symbol("w1"))
+    assert translator.power(u**2, a, L.LiteralInt(2)).ce_format() == "pow(w0 + w1, 2)"
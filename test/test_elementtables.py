@@ -0,0 +1,84 @@
+# Copyright (C) 2021 FFCx contributors
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+import ufl
+from ffcx.compiler import compile_ufl_objects
+from ffcx.ir.analysis.modified_terminals import analyse_modified_terminal
+from ffcx.ir.elementtables import (build_optimized_tables,
+                                   clamp_table_small_numbers,
+                                   tabulate_element_table)
+from ffcx.ir.representationutils import QuadratureRule
+
+
+def test_table_cache_distinct_rules():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    mts = [analyse_modified_terminal(ufl.Coefficient(element))]
+    points = np.array([[0.2, 0.3], [0.6, 0.1]])
+    weights = np.array([0.25, 0.25])
+    rule0 = QuadratureRule(points, weights)
+    rule1 = QuadratureRule(points + 1.0e-10, weights)
+
+    # The rules compare equal within tolerance, but must not share a table
+    assert rule0 == rule1
+    table_cache = {}
+    t0 = build_optimized_tables(rule0, ufl.triangle, "cell", "cell", mts, {}, table_cache=table_cache)
+    t1 = build_optimized_tables(rule1, ufl.triangle, "cell", "cell", mts, {}, table_cache=table_cache)
+    assert len(table_cache) == 2
+    assert not np.array_equal(t0[mts[0]].values, t1[mts[0]].values)
+
+    # Tables for a rule that has been seen before are reused
+    t2 = build_optimized_tables(rule0, ufl.triangle, "cell", "cell", mts, {}, table_cache=table_cache)
+    assert len(table_cache) == 2
+    assert np.array_equal(t2[mts[0]].values, t0[mts[0]].values)
+
+
+def test_table_read_only():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    rule = QuadratureRule(np.array([[1.0 / 3.0, 1.0 / 3.0]]), np.array([0.5]))
+    table = tabulate_element_table(rule, ufl.triangle, "cell", "cell", element, None, (0, 0), 0)[0]
+    assert not table.flags.writeable
+    with pytest.raises(ValueError):
+        table[0, 0, 0, 0] = 2.0
+
+
+def test_table_cache_shared_forms():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    forms = [ufl.inner(u, v) * ufl.dx, ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + ufl.inner(u, v) * ufl.dx]
+
+    # Tables shared between the forms of one call are not modified by
+    # any later stage (writing to them would raise)
+    code = compile_ufl_objects(forms, prefix="tables")
+    assert compile_ufl_objects(forms, prefix="tables") == code
+
+
+def _clamp_reference(table, rtol, atol, numbers):
+    """Clamp values one number at a time, as clamp_table_small_numbers originally did."""
+    table = np.asarray(table)
+    for n in numbers:
+        table[np.where(np.isclose(table, n, rtol=rtol, atol=atol))] = n
+    return table
+
+
+@pytest.mark.parametrize("rtol,atol,numbers", [
+    (1.0e-6, 1.0e-9, (-1.0, 0.0, 1.0)),
+    (1.0e-3, 1.0e-2, (-1.0, 0.0, 1.0, 2.0)),
+    (1.0e-6, 1.0e-9, (0.0, 0.5)),
+    (0.0, 0.6, (-1.0, 0.0, 1.0)),
+])
+def test_clamp_table_small_numbers(rtol, atol, numbers):
+    rng = np.random.default_rng(12)
+    values = np.concatenate([rng.uniform(-2.0, 2.0, 200),
+                             rng.choice([-1.0, 0.0, 0.5, 1.0, 2.0], 200) + rng.normal(0.0, 1.0e-8, 200),
+                             rng.choice([-1.0, 0.0, 1.0], 50) + rng.normal(0.0, 1.0e-3, 50),
+                             [0.0, 1.0, -1.0, 0.5, -0.5, 1.5, np.inf, np.nan]])
+    table = values.reshape(2, -1)
+    expected = _clamp_reference(table.copy(), rtol, atol, numbers)
+    result = clamp_table_small_numbers(table.copy(), rtol=rtol, atol=atol, numbers=numbers)
+    assert np.array_equal(result, expected, equal_nan=True)
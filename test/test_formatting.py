@@ -0,0 +1,30 @@
+# Copyright (C) 2021 FFCx contributors
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import os
+
+from ffcx.formatting import write_code
+
+
+def test_write_code_unchanged(tmp_path):
+    write_code("// header\n", "// source\n", "form", str(tmp_path))
+    filenames = [tmp_path / "form.h", tmp_path / "form.c"]
+
+    # Backdate the files, so that any rewrite is visible in the mtime
+    old_time = 1_000_000_000_000_000_000
+    for filename in filenames:
+        os.utime(filename, ns=(old_time, old_time))
+
+    # Identical code leaves the files untouched
+    write_code("// header\n", "// source\n", "form", str(tmp_path))
+    for filename in filenames:
+        assert os.stat(filename).st_mtime_ns == old_time
+
+    # Changed code is written
+    write_code("// header\n", "// new source\n", "form", str(tmp_path))
+    assert os.stat(filenames[0]).st_mtime_ns == old_time
+    assert os.stat(filenames[1]).st_mtime_ns != old_time
+    assert filenames[1].read_text() == "// new source\n"
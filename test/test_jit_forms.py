@@ -649,3 +649,38 @@ def test_prism(compile_args):
            ffi.cast('double *', coords.ctypes.data), ffi.NULL, ffi.NULL)
 
     assert np.isclose(sum(b), 0.5)
+
+
+@pytest.mark.parametrize("cell,edge,num_dofs,coords,expected", [
+    # Edge 0 of the reference triangle runs from vertex 1 to vertex 2
+    ("triangle", 0, 3, [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], [-1.0, 1.0]),
+    # Edge 2 of the reference quadrilateral runs from vertex 1 to vertex 3
+    ("quadrilateral", 2, 4, [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]], [0.0, 1.0]),
+])
+def test_reference_edge_vectors(compile_args, cell, edge, num_dofs, coords, expected):
+    mesh = ufl.Mesh(ufl.VectorElement("Lagrange", cell, 1))
+    element = ufl.FiniteElement("Lagrange", cell, 1)
+    V = ufl.FunctionSpace(mesh, element)
+    v = ufl.TestFunction(V)
+    edge_vectors = ufl.geometry.ReferenceCellEdgeVectors(mesh)
+
+    L = (edge_vectors[edge, 0] + 2 * edge_vectors[edge, 1]) * v * ufl.dx
+    forms = [L]
+    compiled_forms, module, _ = ffcx.codegeneration.jit.compile_forms(
+        forms, parameters={'scalar_type': 'double'}, cffi_extra_compile_args=compile_args)
+
+    ffi = module.ffi
+    default_integral = compiled_forms[0].integrals(module.lib.cell)[0]
+    b = np.zeros(num_dofs, dtype=np.float64)
+    coords = np.array(coords, dtype=np.float64)
+
+    kernel = getattr(default_integral, "tabulate_tensor_float64")
+    kernel(ffi.cast('double *', b.ctypes.data),
+           ffi.NULL,
+           ffi.NULL,
+           ffi.cast('double *', coords.ctypes.data), ffi.NULL, ffi.NULL)
+
+    # The cell is the reference cell, so the integral of each basis
+    # function is the cell volume divided by the number of vertices
+    volume = 0.5 if cell == "triangle" else 1.0
+    assert np.allclose(b, (expected[0] + 2 * expected[1]) * volume / num_dofs)
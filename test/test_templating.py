@@ -0,0 +1,39 @@
+# Copyright (C) 2021 FFCx contributors
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import pytest
+
+from ffcx.codegeneration import (dofmap_template, expressions_template,
+                                 finite_element_template, form_template,
+                                 integrals_template)
+from ffcx.codegeneration.templating import render, split_template, template_fields
+
+templates = [getattr(module, name)
+             for module in (dofmap_template, expressions_template, finite_element_template,
+                            form_template, integrals_template)
+             for name in ("declaration", "factory")]
+
+
+@pytest.mark.parametrize("template", templates)
+def test_render_ufc_templates(template):
+    mapping = {field: f"<{field}:{i}>" for i, field in enumerate(sorted(template_fields(template)))}
+    assert render(template, mapping) == template.format_map(mapping)
+
+
+def test_render_values():
+    mapping = {"name": "f", "n": 3}
+    assert render("int {name}[{n}] = {{ 0 }}; // {name}", mapping) == "int f[3] = { 0 }; // f"
+
+
+def test_literal_braces():
+    assert split_template("{{ {a} }}") == (("{ ", " }"), ("a", ))
+    assert render("{{}}", {}) == "{}"
+
+
+@pytest.mark.parametrize("template", ["{a:>4}", "{a!r}", "{a", "a}", "{a}}"])
+def test_unsupported_templates(template):
+    with pytest.raises(ValueError):
+        split_template(template)